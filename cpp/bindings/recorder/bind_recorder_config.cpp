@@ -72,6 +72,11 @@ void bind_recorder_config(py::module& m) {
     // 绑定 RecorderConfig (统一配置)
     py::class_<RecorderConfig>(m, "RecorderConfig", "录制器统一配置")
         .def(py::init<>(), "默认构造函数")
+        .def(py::init<const RecorderConfig&>(), py::arg("other"), "拷贝构造函数")
+        .def("__copy__", [](const RecorderConfig& c) { return RecorderConfig(c); })
+        .def(
+            "__deepcopy__", [](const RecorderConfig& c, py::dict) { return RecorderConfig(c); },
+            py::arg("memo"))
         .def_readwrite("zmq_publisher", &RecorderConfig::zmqPublisher, "ZMQ 发布器配置")
         .def_readwrite("video", &RecorderConfig::video, "视频编码配置")
         .def_readwrite("audio", &RecorderConfig::audio, "音频编码配置")
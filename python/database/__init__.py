@@ -5,7 +5,7 @@
 from .database_manager import DatabaseManager
 from .models import (
     Recording, KeyFrameVideo, PromptTemplate,
-    AIAnalysis, TimestampEvent, KeyFinding, AnalysisMetadata
+    AIAnalysis, TimestampEvent, KeyFinding, AnalysisMetadata, AnalysisRun
 )
 from .recording_dao import RecordingDAO
 from .keyframe_dao import KeyFrameVideoDAO
@@ -14,11 +14,13 @@ from .ai_analysis_dao import AIAnalysisDAO
 from .timestamp_event_dao import TimestampEventDAO
 from .key_finding_dao import KeyFindingDAO
 from .analysis_metadata_dao import AnalysisMetadataDAO
+from .analysis_run_dao import AnalysisRunDAO
 
 __all__ = [
     'DatabaseManager',
     'Recording', 'KeyFrameVideo', 'PromptTemplate',
-    'AIAnalysis', 'TimestampEvent', 'KeyFinding', 'AnalysisMetadata',
+    'AIAnalysis', 'TimestampEvent', 'KeyFinding', 'AnalysisMetadata', 'AnalysisRun',
     'RecordingDAO', 'KeyFrameVideoDAO', 'PromptTemplateDAO',
-    'AIAnalysisDAO', 'TimestampEventDAO', 'KeyFindingDAO', 'AnalysisMetadataDAO'
+    'AIAnalysisDAO', 'TimestampEventDAO', 'KeyFindingDAO', 'AnalysisMetadataDAO',
+    'AnalysisRunDAO'
 ]
@@ -76,6 +76,13 @@ class AIAnalysisDAO:
             self.logger.info(f"Deleted AI analysis: {analysis_id}")
         return affected > 0
 
+    def delete_by_recording_id(self, recording_id: str) -> int:
+        """删除直接关联录制记录的分析（关键帧视频关联的分析由外键级联删除）"""
+        return self.db.execute_update("DELETE FROM ai_analysis WHERE recording_id = ?", (recording_id,))
+
+    def delete_all(self) -> int:
+        return self.db.execute_update("DELETE FROM ai_analysis")
+
     def update_rendered_html(self, analysis_id: str, rendered_html: str) -> bool:
         """更新渲染后的 HTML"""
         query = "UPDATE ai_analysis SET rendered_html = ? WHERE analysis_id = ?"
@@ -86,6 +93,18 @@ class AIAnalysisDAO:
         results = self.db.execute_query(query, (recording_id,))
         return [self._row_to_analysis(row) for row in results]
 
+    def get_latest_by_keyframe_id(self, keyframe_id: str) -> Optional[AIAnalysis]:
+        """获取关键帧视频最近一次分析"""
+        query = "SELECT * FROM ai_analysis WHERE keyframe_id = ? ORDER BY started_at DESC LIMIT 1"
+        results = self.db.execute_query(query, (keyframe_id,))
+        return self._row_to_analysis(results[0]) if results else None
+
+    def get_latest_by_recording_id(self, recording_id: str) -> Optional[AIAnalysis]:
+        """获取直接关联录制记录的最近一次分析"""
+        query = "SELECT * FROM ai_analysis WHERE recording_id = ? ORDER BY started_at DESC LIMIT 1"
+        results = self.db.execute_query(query, (recording_id,))
+        return self._row_to_analysis(results[0]) if results else None
+
     def _row_to_analysis(self, row) -> AIAnalysis:
         return AIAnalysis(
             analysis_id=row['analysis_id'],
@@ -16,17 +16,25 @@ class AnalysisMetadataDAO:
         self.db = db_manager
         self.logger = get_logger("AnalysisMetadataDAO")
 
+    _INSERT_SQL = """
+        INSERT INTO analysis_metadata (metadata_id, analysis_id, key, value, data_type)
+        VALUES (?, ?, ?, ?, ?)
+    """
+
     def create(self, metadata: AnalysisMetadata) -> str:
+        self.db.execute_update(self._INSERT_SQL, self._to_params(metadata))
+        return metadata.metadata_id
+
+    def create_many(self, metadata_list: List[AnalysisMetadata]) -> List[str]:
+        """批量插入，一次 executemany 完成"""
+        if metadata_list:
+            self.db.execute_many(self._INSERT_SQL, [self._to_params(m) for m in metadata_list])
+        return [m.metadata_id for m in metadata_list]
+
+    def _to_params(self, metadata: AnalysisMetadata) -> tuple:
         if not metadata.metadata_id:
             metadata.metadata_id = str(uuid.uuid4())
-
-        query = """
-            INSERT INTO analysis_metadata (metadata_id, analysis_id, key, value, data_type)
-            VALUES (?, ?, ?, ?, ?)
-        """
-        params = (metadata.metadata_id, metadata.analysis_id, metadata.key, metadata.value, metadata.data_type)
-        self.db.execute_update(query, params)
-        return metadata.metadata_id
+        return (metadata.metadata_id, metadata.analysis_id, metadata.key, metadata.value, metadata.data_type)
 
     def get_by_id(self, metadata_id: str) -> Optional[AnalysisMetadata]:
         query = "SELECT * FROM analysis_metadata WHERE metadata_id = ?"
@@ -0,0 +1,91 @@
+"""
+本地分析运行记录数据访问对象
+"""
+import uuid
+from typing import Iterable, List, Optional, Set
+
+from . import json_codec
+from .database_manager import DatabaseManager
+from .models import AnalysisRun
+from infrastructure.log_manager import get_logger
+
+
+class AnalysisRunDAO:
+    """分析运行记录 DAO（按插入顺序返回）"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.logger = get_logger("AnalysisRunDAO")
+
+    _INSERT_SQL = """
+        INSERT INTO analysis_run (
+            run_id, recording_id, start_time, end_time,
+            keyframe_count, analyzed_frames, results
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def create(self, run: AnalysisRun) -> str:
+        self.db.execute_update(self._INSERT_SQL, self._to_params(run))
+        return run.run_id
+
+    def create_many(self, runs: Iterable[AnalysisRun]) -> List[str]:
+        """批量插入，一次 executemany 完成；参数逐条生成，不预先构造整份列表"""
+        run_ids = []
+
+        def params():
+            for run in runs:
+                row = self._to_params(run)
+                run_ids.append(run.run_id)
+                yield row
+
+        self.db.execute_many(self._INSERT_SQL, params())
+        return run_ids
+
+    def _to_params(self, run: AnalysisRun) -> tuple:
+        if not run.run_id:
+            run.run_id = str(uuid.uuid4())
+        return (
+            run.run_id, run.recording_id, run.start_time, run.end_time,
+            run.keyframe_count, run.analyzed_frames, json_codec.dumps(run.results)
+        )
+
+    def get_by_id(self, run_id: str) -> Optional[AnalysisRun]:
+        query = "SELECT * FROM analysis_run WHERE run_id = ?"
+        results = self.db.execute_query(query, (run_id,))
+        return self._row_to_run(results[0]) if results else None
+
+    def get_all(self) -> List[AnalysisRun]:
+        results = self.db.execute_query("SELECT * FROM analysis_run ORDER BY rowid")
+        return [self._row_to_run(row) for row in results]
+
+    def get_by_recording_id(self, recording_id: str) -> List[AnalysisRun]:
+        query = "SELECT * FROM analysis_run WHERE recording_id = ? ORDER BY rowid"
+        results = self.db.execute_query(query, (recording_id,))
+        return [self._row_to_run(row) for row in results]
+
+    def get_all_ids(self) -> Set[str]:
+        """仅取主键，不解析 results 列"""
+        return {row[0] for row in self.db.execute_query("SELECT run_id FROM analysis_run")}
+
+    def count(self) -> int:
+        return self.db.execute_query("SELECT COUNT(*) FROM analysis_run")[0][0]
+
+    def delete(self, run_id: str) -> bool:
+        return self.db.execute_update("DELETE FROM analysis_run WHERE run_id = ?", (run_id,)) > 0
+
+    def delete_by_recording_id(self, recording_id: str) -> int:
+        return self.db.execute_update("DELETE FROM analysis_run WHERE recording_id = ?", (recording_id,))
+
+    def delete_all(self) -> int:
+        return self.db.execute_update("DELETE FROM analysis_run")
+
+    def _row_to_run(self, row) -> AnalysisRun:
+        return AnalysisRun(
+            run_id=row['run_id'],
+            recording_id=row['recording_id'],
+            start_time=row['start_time'],
+            end_time=row['end_time'],
+            keyframe_count=row['keyframe_count'],
+            analyzed_frames=row['analyzed_frames'],
+            results=json_codec.loads(row['results'])
+        )
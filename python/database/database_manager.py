@@ -4,7 +4,7 @@ SQLite 数据库管理器
 import sqlite3
 import threading
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
 from contextlib import contextmanager
 
 from infrastructure.log_manager import get_logger
@@ -38,9 +38,18 @@ class DatabaseManager:
     def _get_connection(self) -> sqlite3.Connection:
         if not hasattr(self._local, 'connection'):
             self._local.connection = sqlite3.connect(
-                str(self.db_path), check_same_thread=False, timeout=30.0
+                str(self.db_path), check_same_thread=False, timeout=30.0,
+                cached_statements=256
+            )
+            # WAL 允许读写并发，NORMAL 仅在检查点时 fsync
+            self._local.connection.executescript(
+                "PRAGMA foreign_keys = ON;"
+                "PRAGMA journal_mode = WAL;"
+                "PRAGMA synchronous = NORMAL;"
+                "PRAGMA temp_store = MEMORY;"
+                "PRAGMA mmap_size = 268435456;"
+                "PRAGMA wal_autocheckpoint = 1000;"
             )
-            self._local.connection.execute("PRAGMA foreign_keys = ON")
             self._local.connection.row_factory = sqlite3.Row
         return self._local.connection
 
@@ -48,11 +57,15 @@ class DatabaseManager:
     def get_cursor(self):
         conn = self._get_connection()
         cursor = conn.cursor()
+        # 处于 transaction() 内时由外层统一提交或回滚
+        nested = getattr(self._local, 'transaction_depth', 0) > 0
         try:
             yield cursor
-            conn.commit()
+            if not nested:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if not nested:
+                conn.rollback()
             self.logger.error(f"Database error: {e}")
             raise
         finally:
@@ -60,14 +73,23 @@ class DatabaseManager:
 
     @contextmanager
     def transaction(self):
+        """在单个事务中执行多条写入，可嵌套，仅最外层提交"""
         conn = self._get_connection()
+        depth = getattr(self._local, 'transaction_depth', 0)
+        if depth == 0 and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.transaction_depth = depth + 1
         try:
             yield conn
-            conn.commit()
+            if depth == 0:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
-            self.logger.error(f"Transaction error: {e}")
+            if depth == 0:
+                conn.rollback()
+                self.logger.error(f"Transaction error: {e}")
             raise
+        finally:
+            self._local.transaction_depth = depth
 
     def _initialize_database(self):
         with self.get_cursor() as cursor:
@@ -89,6 +111,12 @@ class DatabaseManager:
             """)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_recording_created_at ON recording(created_at DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_recording_title ON recording(title)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_recording_updated_at ON recording(updated_at)")
+            # 按状态筛选并按创建时间排序的表达式索引（状态存于 metadata JSON 中）
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_recording_status_created_at "
+                "ON recording(json_extract(metadata, '$.status'), created_at DESC)"
+            )
 
             # keyframe_video 表
             cursor.execute("""
@@ -161,7 +189,11 @@ class DatabaseManager:
             except:
                 pass  # 列已存在
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_keyframe_id ON ai_analysis(keyframe_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_recording_id ON ai_analysis(recording_id)")
+            # 按录制记录取分析时直接走 (recording_id, started_at) 范围扫描，替代单列索引
+            cursor.execute("DROP INDEX IF EXISTS idx_analysis_recording_id")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_recording_started ON ai_analysis(recording_id, started_at DESC)"
+            )
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_prompt_id ON ai_analysis(prompt_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_status ON ai_analysis(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_completed_at ON ai_analysis(completed_at DESC)")
@@ -218,6 +250,20 @@ class DatabaseManager:
             """)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_metadata_analysis_id ON analysis_metadata(analysis_id)")
 
+            # analysis_run 表（本地关键帧分析运行记录）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_run (
+                    run_id TEXT PRIMARY KEY,
+                    recording_id TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    keyframe_count INTEGER DEFAULT 0,
+                    analyzed_frames INTEGER DEFAULT 0,
+                    results TEXT DEFAULT '[]'
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_run_recording_id ON analysis_run(recording_id)")
+
     def execute_query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         with self.get_cursor() as cursor:
             cursor.execute(query, params)
@@ -228,6 +274,11 @@ class DatabaseManager:
             cursor.execute(query, params)
             return cursor.rowcount
 
+    def execute_many(self, query: str, params_seq: Iterable[tuple]) -> int:
+        with self.get_cursor() as cursor:
+            cursor.executemany(query, params_seq)
+            return cursor.rowcount
+
     def close(self):
         if hasattr(self._local, 'connection'):
             self._local.connection.close()
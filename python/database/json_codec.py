@@ -0,0 +1,24 @@
+"""
+JSON 列编解码
+优先使用 orjson，未安装时回退到标准库 json
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> str:
+    """序列化为 JSON 文本（保留非 ASCII 字符）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def loads(text):
+    """解析 JSON 文本"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
@@ -1,10 +1,10 @@
 """
 关键要点数据访问对象
 """
-import json
 import uuid
 from typing import List, Optional
 
+from . import json_codec
 from .database_manager import DatabaseManager
 from .models import KeyFinding
 from infrastructure.log_manager import get_logger
@@ -17,24 +17,32 @@ class KeyFindingDAO:
         self.db = db_manager
         self.logger = get_logger("KeyFindingDAO")
 
+    _INSERT_SQL = """
+        INSERT INTO key_finding (
+            finding_id, analysis_id, sequence_order, category,
+            title, content, related_timestamps, confidence_score
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def create(self, finding: KeyFinding) -> str:
+        self.db.execute_update(self._INSERT_SQL, self._to_params(finding))
+        return finding.finding_id
+
+    def create_many(self, findings: List[KeyFinding]) -> List[str]:
+        """批量插入，一次 executemany 完成"""
+        if findings:
+            self.db.execute_many(self._INSERT_SQL, [self._to_params(f) for f in findings])
+        return [f.finding_id for f in findings]
+
+    def _to_params(self, finding: KeyFinding) -> tuple:
         if not finding.finding_id:
             finding.finding_id = str(uuid.uuid4())
-
-        query = """
-            INSERT INTO key_finding (
-                finding_id, analysis_id, sequence_order, category,
-                title, content, related_timestamps, confidence_score
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
+        return (
             finding.finding_id, finding.analysis_id, finding.sequence_order,
             finding.category, finding.title, finding.content,
-            json.dumps(finding.related_timestamps, ensure_ascii=False),
+            json_codec.dumps(finding.related_timestamps),
             finding.confidence_score
         )
-        self.db.execute_update(query, params)
-        return finding.finding_id
 
     def get_by_id(self, finding_id: str) -> Optional[KeyFinding]:
         query = "SELECT * FROM key_finding WHERE finding_id = ?"
@@ -62,6 +70,6 @@ class KeyFindingDAO:
             category=row['category'],
             title=row['title'],
             content=row['content'],
-            related_timestamps=json.loads(row['related_timestamps']),
+            related_timestamps=json_codec.loads(row['related_timestamps']),
             confidence_score=row['confidence_score']
         )
@@ -1,11 +1,11 @@
 """
 关键帧视频数据访问对象
 """
-import json
 import uuid
 from datetime import datetime
 from typing import List, Optional
 
+from . import json_codec
 from .database_manager import DatabaseManager
 from .models import KeyFrameVideo
 from infrastructure.log_manager import get_logger
@@ -36,7 +36,7 @@ class KeyFrameVideoDAO:
             keyframe.keyframe_video_path, keyframe.keyframe_audio_path,
             keyframe.keyframe_count, keyframe.duration_seconds,
             keyframe.file_size_bytes, keyframe.compression_ratio,
-            keyframe.created_at, json.dumps(keyframe.extraction_config, ensure_ascii=False)
+            keyframe.created_at, json_codec.dumps(keyframe.extraction_config)
         )
         self.db.execute_update(query, params)
         self.logger.info(f"Created keyframe video: {keyframe.keyframe_id}")
@@ -74,5 +74,5 @@ class KeyFrameVideoDAO:
             file_size_bytes=row['file_size_bytes'],
             compression_ratio=row['compression_ratio'],
             created_at=row['created_at'],
-            extraction_config=json.loads(row['extraction_config'])
+            extraction_config=json_codec.loads(row['extraction_config'])
         )
@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Recording:
     """录制记录数据类"""
     record_id: str = ""
@@ -21,7 +21,7 @@ class Recording:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyFrameVideo:
     """关键帧视频数据类"""
     keyframe_id: str = ""
@@ -36,7 +36,7 @@ class KeyFrameVideo:
     extraction_config: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptTemplate:
     """提示词模板数据类"""
     prompt_id: str = ""
@@ -51,7 +51,7 @@ class PromptTemplate:
     variables: List[Dict[str, str]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AIAnalysis:
     """AI 分析结果数据类"""
     analysis_id: str = ""
@@ -72,7 +72,7 @@ class AIAnalysis:
     error_message: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TimestampEvent:
     """时间戳事件数据类"""
     event_id: str = ""
@@ -86,7 +86,7 @@ class TimestampEvent:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyFinding:
     """关键要点数据类"""
     finding_id: str = ""
@@ -99,7 +99,7 @@ class KeyFinding:
     confidence_score: int = 80
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisMetadata:
     """分析元数据数据类"""
     metadata_id: str = ""
@@ -107,3 +107,15 @@ class AnalysisMetadata:
     key: str = ""
     value: str = ""
     data_type: str = "string"
+
+
+@dataclass(slots=True)
+class AnalysisRun:
+    """本地关键帧分析运行记录数据类"""
+    run_id: str = ""
+    recording_id: str = ""
+    start_time: str = ""
+    end_time: str = ""
+    keyframe_count: int = 0
+    analyzed_frames: int = 0
+    results: List[Dict[str, Any]] = field(default_factory=list)
@@ -1,11 +1,11 @@
 """
 提示词模板数据访问对象
 """
-import json
 import uuid
 from datetime import datetime
 from typing import List, Optional, Dict
 
+from . import json_codec
 from .database_manager import DatabaseManager
 from .models import PromptTemplate
 from infrastructure.log_manager import get_logger
@@ -36,8 +36,8 @@ class PromptTemplateDAO:
             template.prompt_id, template.name, template.description,
             template.prompt_content, template.category, template.is_default,
             template.created_at, template.updated_at,
-            json.dumps(template.tags, ensure_ascii=False),
-            json.dumps(template.variables, ensure_ascii=False)
+            json_codec.dumps(template.tags),
+            json_codec.dumps(template.variables)
         )
         self.db.execute_update(query, params)
         self.logger.info(f"Created prompt template: {template.prompt_id}")
@@ -73,8 +73,8 @@ class PromptTemplateDAO:
         params = (
             template.name, template.description, template.prompt_content,
             template.category, template.is_default, template.updated_at,
-            json.dumps(template.tags, ensure_ascii=False),
-            json.dumps(template.variables, ensure_ascii=False),
+            json_codec.dumps(template.tags),
+            json_codec.dumps(template.variables),
             template.prompt_id
         )
         return self.db.execute_update(query, params) > 0
@@ -111,6 +111,6 @@ class PromptTemplateDAO:
             is_default=row['is_default'],
             created_at=row['created_at'],
             updated_at=row['updated_at'],
-            tags=json.loads(row['tags']),
-            variables=json.loads(row['variables'])
+            tags=json_codec.loads(row['tags']),
+            variables=json_codec.loads(row['variables'])
         )
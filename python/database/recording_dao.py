@@ -1,11 +1,11 @@
 """
 录制记录数据访问对象
 """
-import json
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from . import json_codec
 from .database_manager import DatabaseManager
 from .models import Recording
 from infrastructure.log_manager import get_logger
@@ -38,8 +38,8 @@ class RecordingDAO:
             recording.title, recording.description,
             recording.duration_seconds, recording.file_size_bytes,
             recording.thumbnail_path, recording.created_at, recording.updated_at,
-            json.dumps(recording.tags, ensure_ascii=False),
-            json.dumps(recording.metadata, ensure_ascii=False)
+            json_codec.dumps(recording.tags),
+            json_codec.dumps(recording.metadata)
         )
         self.db.execute_update(query, params)
         self.logger.info(f"Created recording: {recording.record_id}")
@@ -60,6 +60,54 @@ class RecordingDAO:
         results = self.db.execute_query(query, (limit, offset))
         return [self._row_to_recording(row) for row in results]
 
+    def list_all(self, limit: int = -1, status: Optional[str] = None) -> List[Recording]:
+        """按创建时间倒序列出录制记录，limit 为 -1 时不限制数量"""
+        if status is None:
+            query = "SELECT * FROM recording ORDER BY created_at DESC LIMIT ?"
+            params = (limit,)
+        else:
+            query = """
+                SELECT * FROM recording WHERE json_extract(metadata, '$.status') = ?
+                ORDER BY created_at DESC LIMIT ?
+            """
+            params = (status, limit)
+        results = self.db.execute_query(query, params)
+        return [self._row_to_recording(row) for row in results]
+
+    def search(self, keyword: str, status: Optional[str] = None) -> List[Recording]:
+        """按视频路径或描述模糊搜索"""
+        pattern = "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = """
+            SELECT * FROM recording
+            WHERE (original_video_path LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')
+        """
+        params = [pattern, pattern]
+        if status is not None:
+            query += " AND json_extract(metadata, '$.status') = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC"
+        results = self.db.execute_query(query, tuple(params))
+        return [self._row_to_recording(row) for row in results]
+
+    def aggregate_stats(self, status: Optional[str] = None) -> Tuple[int, int, int, int]:
+        """
+        单条查询汇总录制统计
+
+        Returns:
+            (记录数, 总时长, 总大小, 总关键帧数)
+        """
+        query = """
+            SELECT COUNT(*), TOTAL(duration_seconds), TOTAL(file_size_bytes),
+                   TOTAL(json_extract(metadata, '$.keyframe_count'))
+            FROM recording
+        """
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE json_extract(metadata, '$.status') = ?"
+            params = (status,)
+        count, duration, size, keyframes = self.db.execute_query(query, params)[0]
+        return count, int(duration), int(size), int(keyframes)
+
     def update(self, recording: Recording) -> bool:
         recording.updated_at = datetime.now().isoformat()
         query = """
@@ -72,18 +120,34 @@ class RecordingDAO:
         params = (
             recording.title, recording.description, recording.duration_seconds,
             recording.file_size_bytes, recording.thumbnail_path, recording.updated_at,
-            json.dumps(recording.tags, ensure_ascii=False),
-            json.dumps(recording.metadata, ensure_ascii=False),
+            json_codec.dumps(recording.tags),
+            json_codec.dumps(recording.metadata),
             recording.record_id
         )
         return self.db.execute_update(query, params) > 0
 
+    def toggle_favorite(self, record_id: str) -> bool:
+        # 在 SQLite 内原地翻转 metadata 中的收藏标记，避免读出并重写整行
+        query = """
+            UPDATE recording SET
+                metadata = json_set(
+                    COALESCE(metadata, '{}'), '$.is_favorite',
+                    json(CASE WHEN json_extract(metadata, '$.is_favorite') THEN 'false' ELSE 'true' END)
+                ),
+                updated_at = ?
+            WHERE record_id = ?
+        """
+        return self.db.execute_update(query, (datetime.now().isoformat(), record_id)) > 0
+
     def delete(self, record_id: str) -> bool:
         affected = self.db.execute_update("DELETE FROM recording WHERE record_id = ?", (record_id,))
         if affected > 0:
             self.logger.info(f"Deleted recording: {record_id}")
         return affected > 0
 
+    def delete_all(self) -> int:
+        return self.db.execute_update("DELETE FROM recording")
+
     def search_by_title(self, keyword: str) -> List[Recording]:
         query = "SELECT * FROM recording WHERE title LIKE ? ORDER BY created_at DESC"
         results = self.db.execute_query(query, (f"%{keyword}%",))
@@ -100,6 +164,6 @@ class RecordingDAO:
             thumbnail_path=row['thumbnail_path'],
             created_at=row['created_at'],
             updated_at=row['updated_at'],
-            tags=json.loads(row['tags']),
-            metadata=json.loads(row['metadata'])
+            tags=json_codec.loads(row['tags']),
+            metadata=json_codec.loads(row['metadata'])
         )
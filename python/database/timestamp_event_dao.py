@@ -1,10 +1,10 @@
 """
 时间戳事件数据访问对象
 """
-import json
 import uuid
 from typing import List, Optional
 
+from . import json_codec
 from .database_manager import DatabaseManager
 from .models import TimestampEvent
 from infrastructure.log_manager import get_logger
@@ -17,24 +17,32 @@ class TimestampEventDAO:
         self.db = db_manager
         self.logger = get_logger("TimestampEventDAO")
 
+    _INSERT_SQL = """
+        INSERT INTO timestamp_event (
+            event_id, analysis_id, timestamp_seconds, event_type,
+            title, description, thumbnail_path, importance_score, metadata
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def create(self, event: TimestampEvent) -> str:
+        self.db.execute_update(self._INSERT_SQL, self._to_params(event))
+        return event.event_id
+
+    def create_many(self, events: List[TimestampEvent]) -> List[str]:
+        """批量插入，一次 executemany 完成"""
+        if events:
+            self.db.execute_many(self._INSERT_SQL, [self._to_params(e) for e in events])
+        return [e.event_id for e in events]
+
+    def _to_params(self, event: TimestampEvent) -> tuple:
         if not event.event_id:
             event.event_id = str(uuid.uuid4())
-
-        query = """
-            INSERT INTO timestamp_event (
-                event_id, analysis_id, timestamp_seconds, event_type,
-                title, description, thumbnail_path, importance_score, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
+        return (
             event.event_id, event.analysis_id, event.timestamp_seconds,
             event.event_type, event.title, event.description,
             event.thumbnail_path, event.importance_score,
-            json.dumps(event.metadata, ensure_ascii=False)
+            json_codec.dumps(event.metadata)
         )
-        self.db.execute_update(query, params)
-        return event.event_id
 
     def get_by_id(self, event_id: str) -> Optional[TimestampEvent]:
         query = "SELECT * FROM timestamp_event WHERE event_id = ?"
@@ -68,5 +76,5 @@ class TimestampEventDAO:
             description=row['description'],
             thumbnail_path=row['thumbnail_path'],
             importance_score=row['importance_score'],
-            metadata=json.loads(row['metadata'])
+            metadata=json_codec.loads(row['metadata'])
         )
@@ -56,6 +56,8 @@ class ModuleManager:
             # 源码运行状态
             self.build_python_path = Path(__file__).parent.parent.parent / "build" / "python"
             self.build_bin_path = Path(__file__).parent.parent.parent / "build" / "bin"
+        # 构建路径只需注册一次，之后获取模块时跳过
+        self._build_path_ready = False
 
         # 监控标志
         self._is_monitoring = False
@@ -67,6 +69,10 @@ class ModuleManager:
 
     def _ensure_build_path(self):
         """确保构建路径在Python搜索路径中"""
+        if self._build_path_ready:
+            return
+        self._build_path_ready = True
+
         build_path_str = str(self.build_python_path)
 
         if build_path_str not in sys.path:
@@ -2,16 +2,66 @@
 分析服务
 封装关键帧分析业务逻辑
 """
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, Mapping, Tuple, TYPE_CHECKING
+from types import MappingProxyType
 from datetime import datetime
+import os
+import queue
 import threading
+import time
+import uuid
 from dataclasses import dataclass, field
+import inspect
 
 from infrastructure.process_manager import ModuleManager, ProcessStatus
 from infrastructure.log_manager import get_logger
 
+if TYPE_CHECKING:
+    from services.history_service import HistoryService
 
-@dataclass
+
+# 分析器状态名 -> 模块管理器状态（按名称精确匹配）
+_STATUS_MAP = {
+    "IDLE": ProcessStatus.STOPPED,
+    "RUNNING": ProcessStatus.RUNNING,
+    "ERROR": ProcessStatus.ERROR,
+}
+
+# 后台写入线程：单次最多合并的写入数量与合并等待时间
+_WRITE_BATCH_SIZE = 32
+_WRITE_BATCH_TIMEOUT = 0.01
+_WRITER_STOP = object()
+
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+
+def _validate_callback(callback: Callable):
+    """注册时校验回调：必须可调用且能接收一个位置参数"""
+    if not callable(callback):
+        raise TypeError(f"Callback must be callable, got {type(callback).__name__}")
+    try:
+        signature = inspect.signature(callback)
+    except (TypeError, ValueError):
+        return  # 内置/扩展函数无法获取签名，跳过参数检查
+    try:
+        signature.bind(None)
+    except TypeError:
+        raise TypeError(f"Callback {callback!r} must accept exactly one positional argument") from None
+
+
+def _fan_out(callbacks: tuple, arg: Any, log_error: Callable, label: str):
+    """依次调用回调；异常时记录日志并从下一个回调继续（正常路径只建立一次 try）"""
+    it = iter(callbacks)
+    while True:
+        try:
+            for callback in it:
+                callback(arg)
+            return
+        except Exception as e:
+            log_error(f"Error in {label} callback: {e}")
+
+
+@dataclass(slots=True)
 class KeyFrameResult:
     """关键帧结果数据类"""
     frame_index: int
@@ -33,7 +83,7 @@ class KeyFrameResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisSession:
     """分析会话数据类"""
     session_id: str
@@ -42,14 +92,33 @@ class AnalysisSession:
     end_time: Optional[datetime] = None
     keyframe_results: List[KeyFrameResult] = field(default_factory=list)
     stats: Dict[str, Any] = field(default_factory=dict)
+    # 创建时缓存的时间信息，避免轮询时重复格式化
+    start_time_iso: str = ""
+    start_monotonic_ns: int = 0
+    end_time_iso: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.start_time_iso:
+            self.start_time_iso = self.start_time.isoformat()
+        if not self.start_monotonic_ns:
+            self.start_monotonic_ns = time.monotonic_ns()
+
+    def finish(self, end_time: datetime):
+        """标记会话结束并缓存结束时间字符串"""
+        self.end_time = end_time
+        self.end_time_iso = end_time.isoformat()
+
+    def elapsed(self) -> float:
+        """会话已持续的秒数（单调时钟）"""
+        return (time.monotonic_ns() - self.start_monotonic_ns) / 1e9
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
             "session_id": self.session_id,
             "recording_id": self.recording_id,
-            "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "start_time": self.start_time_iso,
+            "end_time": self.end_time_iso,
             "keyframe_count": len(self.keyframe_results),
             "stats": self.stats.copy()
         }
@@ -77,25 +146,35 @@ class AnalyzerService:
 
         # 当前会话
         self._current_session: Optional[AnalysisSession] = None
+        # 原生停止进行中：会话保持占用，停止返回前不能重复停止或开始新的分析
+        self._stopping = False
+
+        # 关键帧结果快照（版本号未变化时直接复用）
+        self._keyframe_version = 0
+        self._keyframe_snapshot: Tuple[KeyFrameResult, ...] = ()
+        self._snapshot_key: Optional[Tuple[str, int]] = None
         
         # 历史记录服务
-        from services.history_service import HistoryService
-        self._history_service: Optional[HistoryService] = None
+        self._history_service: Optional["HistoryService"] = None
 
-        # 回调函数
-        self._status_callbacks = []
-        self._keyframe_callbacks = []
-        self._error_callbacks = []
-        self._keyframe_video_callbacks = []
+        # 回调函数（不可变元组，注册时整体替换，分发时无需加锁）
+        self._status_callbacks: tuple = ()
+        self._keyframe_callbacks: tuple = ()
+        self._error_callbacks: tuple = ()
+        self._keyframe_video_callbacks: tuple = ()
 
         # 状态锁
         self._lock = threading.Lock()
 
-        # 检测器配置
-        self._detector_config = {
-            "scene_change": {"enabled": True, "threshold": 0.85},
-            "motion": {"enabled": True, "threshold": 0.5},
-            "text": {"enabled": False, "threshold": 0.7}
+        # 历史记录后台写入队列（回调线程只入队，不做数据库I/O）
+        self._write_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer_thread: Optional[threading.Thread] = None
+
+        # 检测器配置（只读映射，修改时整体替换）
+        self._detector_config: Dict[str, Mapping[str, Any]] = {
+            "scene_change": MappingProxyType({"enabled": True, "threshold": 0.85}),
+            "motion": MappingProxyType({"enabled": True, "threshold": 0.5}),
+            "text": MappingProxyType({"enabled": False, "threshold": 0.7})
         }
 
         # 实时分析模式状态
@@ -136,7 +215,8 @@ class AnalyzerService:
                 self.logger.error("Failed to create analyzer API")
                 return False
 
-            # 设置内部回调
+            # 启动后台写入线程并设置内部回调
+            self._start_writer()
             self._setup_internal_callbacks()
 
             self.logger.info("AnalyzerService initialized successfully")
@@ -156,23 +236,19 @@ class AnalyzerService:
             self.logger.debug(f"Analyzer status changed: {status}")
 
             # 更新模块管理器状态
-            if hasattr(status, 'name'):
-                if 'IDLE' in status.name:
-                    self.module_manager.set_analyzer_status(ProcessStatus.STOPPED)
-                elif 'RUNNING' in status.name:
-                    self.module_manager.set_analyzer_status(ProcessStatus.RUNNING)
-                elif 'ERROR' in status.name:
-                    self.module_manager.set_analyzer_status(ProcessStatus.ERROR)
+            process_status = _STATUS_MAP.get(getattr(status, 'name', None))
+            if process_status is not None:
+                self.module_manager.set_analyzer_status(process_status)
 
             # 通知外部回调
-            for callback in self._status_callbacks:
-                try:
-                    callback(status)
-                except Exception as e:
-                    self.logger.error(f"Error in status callback: {e}")
+            _fan_out(self._status_callbacks, status, self.logger.error, "status")
 
         def on_keyframe(keyframe_data):
             """处理关键帧检测"""
+            # 无会话且无订阅者时直接丢弃（如停止时的竞态事件）
+            if self._current_session is None and not self._keyframe_callbacks:
+                return
+
             self.logger.debug(f"Keyframe detected: {keyframe_data}")
 
             # 解析关键帧数据
@@ -197,117 +273,180 @@ class AnalyzerService:
                 # 添加到当前会话
                 if self._current_session is not None:
                     self._current_session.keyframe_results.append(result)
+                    self._keyframe_version += 1
 
                 # 通知外部回调
-                for callback in self._keyframe_callbacks:
-                    try:
-                        callback(result)
-                    except Exception as e:
-                        self.logger.error(f"Error in keyframe callback: {e}")
+                _fan_out(self._keyframe_callbacks, result, self.logger.error, "keyframe")
 
             except Exception as e:
                 self.logger.error(f"Error processing keyframe data: {e}")
 
         def on_error(error_msg):
             """处理错误"""
-            self.logger.error(f"Analyzer error: {error_msg}")
-            for callback in self._error_callbacks:
-                try:
-                    callback(error_msg)
-                except Exception as e:
-                    self.logger.error(f"Error in error callback: {e}")
+            log_error = self.logger.error
+            log_error(f"Analyzer error: {error_msg}")
+            _fan_out(self._error_callbacks, error_msg, log_error, "error")
 
         self._api.set_status_callback(on_status_change)
         self._api.set_keyframe_callback(on_keyframe)
 
         def on_keyframe_video(video_path):
             """处理关键帧视频生成"""
+            if self._history_service is None and not self._keyframe_video_callbacks:
+                return
+
             self.logger.info(f"Keyframe video generated: {video_path}")
             
-            # 保存到数据库
-            if self._history_service and self._current_session:
+            # 保存到数据库（交给后台写入线程）
+            session = self._current_session
+            if self._history_service and session:
                 try:
-                    import os
-                    file_size = os.path.getsize(video_path) if os.path.exists(video_path) else 0
-                    keyframe_count = len(self._current_session.keyframe_results)
-                    recording_id = self._current_session.recording_id
-                    
-                    # 尝试获取视频时长（此处简化处理，实际可能需要cv2读取）
-                    duration = 0.0
-                    if keyframe_count > 0:
-                        # 假设每秒1帧或者类似逻辑，或者通过属性获取
-                        pass
-
-                    self._history_service.add_keyframe_video(
-                        recording_id=recording_id,
-                        video_path=video_path,
-                        keyframe_count=keyframe_count,
-                        duration=duration,
-                        file_size=file_size,
-                        extraction_config=self._detector_config
-                    )
+                    try:
+                        file_size = os.stat(video_path).st_size
+                    except FileNotFoundError:
+                        file_size = 0
+
+                    # 视频时长暂不解析（实际可能需要cv2读取）
+                    self._write_queue.put({
+                        "recording_id": session.recording_id,
+                        "video_path": video_path,
+                        "keyframe_count": len(session.keyframe_results),
+                        "duration": 0.0,
+                        "file_size": file_size,
+                        "extraction_config": self._detector_config
+                    })
                 except Exception as e:
-                    self.logger.error(f"Failed to auto-save keyframe video: {e}")
+                    self.logger.error(f"Failed to queue keyframe video for saving: {e}")
 
-            for callback in self._keyframe_video_callbacks:
-                try:
-                    callback(video_path)
-                except Exception as e:
-                    self.logger.error(f"Error in keyframe video callback: {e}")
+            _fan_out(self._keyframe_video_callbacks, video_path, self.logger.error, "keyframe video")
 
         self._api.set_keyframe_video_callback(on_keyframe_video)
 
+    def _start_writer(self):
+        """启动历史记录后台写入线程"""
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            return
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="AnalyzerHistoryWriter", daemon=True
+        )
+        self._writer_thread.start()
+
+    def _stop_writer(self, timeout: float = 5.0):
+        """写完队列中剩余的记录后停止后台写入线程"""
+        if self._writer_thread is None:
+            return
+        self._write_queue.put(_WRITER_STOP)
+        self._writer_thread.join(timeout=timeout)
+        self._writer_thread = None
+
+    def _writer_loop(self):
+        """后台写入循环：阻塞取一条，再在短时间内合并后续写入"""
+        q = self._write_queue
+        running = True
+        while running:
+            batch = [q.get()]
+            while len(batch) < _WRITE_BATCH_SIZE:
+                try:
+                    batch.append(q.get(timeout=_WRITE_BATCH_TIMEOUT))
+                except queue.Empty:
+                    break
+
+            items = [item for item in batch if item is not _WRITER_STOP]
+            running = len(items) == len(batch)
+            history_service = self._history_service
+            if history_service is None or not items:
+                continue
+
+            # 同一批写入合并为一个数据库事务，单条失败不影响其余记录
+            try:
+                with history_service.buffered():
+                    for item in items:
+                        try:
+                            # 只读映射转为普通字典以便序列化
+                            item["extraction_config"] = {
+                                name: dict(config) for name, config in item["extraction_config"].items()
+                            }
+                            history_service.add_keyframe_video(**item)
+                        except Exception as e:
+                            self.logger.error(f"Failed to auto-save keyframe video: {e}")
+            except Exception as e:
+                self.logger.error(f"Failed to commit keyframe video batch: {e}")
+
     def _detect_detector_type(self, data: Dict[str, Any]) -> str:
         """根据数据推断检测器类型"""
         # 这里可以根据实际数据结构判断
         # 简化处理，默认返回scene_change
         return "scene_change"
 
-    def start_analysis(self, recording_id: str = "") -> bool:
+    def _reserve_session(self, **kwargs) -> Optional[AnalysisSession]:
         """
-        开始实时分析 (ZMQ 订阅模式)
-
-        Args:
-            recording_id: 关联的录制记录ID
+        在锁内检查并占用当前会话
 
         Returns:
-            bool: 成功返回True
+            AnalysisSession: 占用成功返回新会话，已有会话或API未初始化返回None
         """
         with self._lock:
             if self._current_session is not None:
                 self.logger.warning("Analysis already in progress")
-                return False
+                return None
 
             if self._api is None:
                 self.logger.error("Analyzer API not initialized")
-                return False
+                return None
+
+            session = AnalysisSession(
+                session_id=uuid.uuid4().hex,
+                start_time=datetime.now(),
+                **kwargs
+            )
+            self._current_session = session
+            return session
+
+    def _release_session(self, session: AnalysisSession):
+        """API调用失败时撤销占用的会话"""
+        with self._lock:
+            if self._current_session is session:
+                self._current_session = None
 
-            try:
-                # 创建新会话
-                import uuid
-                self._current_session = AnalysisSession(
-                    session_id=str(uuid.uuid4()),
-                    recording_id=recording_id,
-                    start_time=datetime.now(),
-                    stats={"mode": "realtime"}
-                )
+    def _finish_stop(self, session: Optional[AnalysisSession], stopped: bool):
+        """原生停止返回后结束停止状态；停止成功时释放会话占用"""
+        with self._lock:
+            self._stopping = False
+            if stopped and self._current_session is session:
+                self._current_session = None
 
-                # 启动分析
-                result = self._api.start()
+    def start_analysis(self, recording_id: str = "") -> bool:
+        """
+        开始实时分析 (ZMQ 订阅模式)
 
-                if result:
-                    self.logger.info("Real-time analysis started")
-                    return True
-                else:
-                    self.logger.error(f"Failed to start analysis: {self._api.last_error}")
-                    self._current_session = None
-                    return False
+        Args:
+            recording_id: 关联的录制记录ID
 
-            except Exception as e:
-                self.logger.error(f"Error starting analysis: {e}")
-                self._current_session = None
+        Returns:
+            bool: 成功返回True
+        """
+        # 锁内只做状态切换，API调用在锁外执行
+        session = self._reserve_session(recording_id=recording_id, stats={"mode": "realtime"})
+        if session is None:
+            return False
+
+        try:
+            # 启动分析
+            result = self._api.start()
+
+            if result:
+                self.logger.info("Real-time analysis started")
+                return True
+            else:
+                self.logger.error(f"Failed to start analysis: {self._api.last_error}")
+                self._release_session(session)
                 return False
 
+        except Exception as e:
+            self.logger.error(f"Error starting analysis: {e}")
+            self._release_session(session)
+            return False
+
     def start_file_analysis(self, file_path: str) -> bool:
         """
         开始视频文件分析 (离线模式)
@@ -318,40 +457,27 @@ class AnalyzerService:
         Returns:
             bool: 成功启动返回True
         """
-        with self._lock:
-            if self._current_session is not None:
-                self.logger.warning("Analysis already in progress")
-                return False
-
-            if self._api is None:
-                self.logger.error("Analyzer API not initialized")
-                return False
-
-            try:
-                # 创建新会话
-                import uuid
-                self._current_session = AnalysisSession(
-                    session_id=str(uuid.uuid4()),
-                    start_time=datetime.now(),
-                    stats={"mode": "offline", "file_path": file_path}
-                )
-
-                # 调用底层 C++ 离线分析接口
-                result = self._api.analyze_video_file(file_path)
+        session = self._reserve_session(stats={"mode": "offline", "file_path": file_path})
+        if session is None:
+            return False
 
-                if result:
-                    self.logger.info(f"Offline file analysis started: {file_path}")
-                    return True
-                else:
-                    self.logger.error(f"Failed to start file analysis: {self._api.last_error}")
-                    self._current_session = None
-                    return False
+        try:
+            # 调用底层 C++ 离线分析接口
+            result = self._api.analyze_video_file(file_path)
 
-            except Exception as e:
-                self.logger.error(f"Error starting file analysis: {e}")
-                self._current_session = None
+            if result:
+                self.logger.info(f"Offline file analysis started: {file_path}")
+                return True
+            else:
+                self.logger.error(f"Failed to start file analysis: {self._api.last_error}")
+                self._release_session(session)
                 return False
 
+        except Exception as e:
+            self.logger.error(f"Error starting file analysis: {e}")
+            self._release_session(session)
+            return False
+
     def stop_analysis(self) -> bool:
         """
         停止分析
@@ -360,49 +486,59 @@ class AnalyzerService:
             bool: 成功返回True
         """
         with self._lock:
-            if self._current_session is None:
+            session = self._current_session
+            if session is None or self._stopping:
                 self.logger.warning("No active analysis session")
                 return False
 
-            if self._api is None:
+            api = self._api
+            if api is None:
                 self.logger.error("Analyzer API not initialized")
                 return False
 
-            try:
-                # 停止分析
-                self._api.stop()
+            # 标记停止中，防止并发重复停止；会话保持占用直到原生停止返回
+            self._stopping = True
 
-                # 更新会话
-                self._current_session.end_time = datetime.now()
+        try:
+            # 停止分析
+            api.stop()
 
-                # 更新统计信息
-                stats = self._api.stats
-                if hasattr(stats, 'to_dict'):
-                    self._current_session.stats = stats.to_dict()
+            # 更新会话
+            session.finish(datetime.now())
 
-                session_info = self._current_session.to_dict()
-                self.logger.info(f"Analysis stopped: {session_info['keyframe_count']} keyframes detected")
+            # 更新统计信息
+            stats = api.stats
+            if hasattr(stats, 'to_dict'):
+                session.stats = stats.to_dict()
 
-                # 清空会话
-                self._current_session = None
+            session_info = session.to_dict()
+            self.logger.info(f"Analysis stopped: {session_info['keyframe_count']} keyframes detected")
 
-                return True
+        except Exception as e:
+            self.logger.error(f"Error stopping analysis: {e}")
+            # 停止失败时保留会话
+            self._finish_stop(session, False)
+            return False
 
-            except Exception as e:
-                self.logger.error(f"Error stopping analysis: {e}")
-                return False
+        self._finish_stop(session, True)
+        return True
 
-    def get_keyframe_results(self) -> List[KeyFrameResult]:
+    def get_keyframe_results(self) -> Tuple[KeyFrameResult, ...]:
         """
-        获取关键帧结果列表
+        获取关键帧结果快照（元组，不再返回列表）
 
         Returns:
-            List[KeyFrameResult]: 关键帧结果列表
+            Tuple[KeyFrameResult, ...]: 关键帧结果的只读元组，结果未变化时返回同一对象；无会话时为空元组
         """
-        if self._current_session is None:
-            return []
+        session = self._current_session
+        if session is None:
+            return ()
 
-        return self._current_session.keyframe_results.copy()
+        key = (session.session_id, self._keyframe_version)
+        if self._snapshot_key != key:
+            self._keyframe_snapshot = tuple(session.keyframe_results)
+            self._snapshot_key = key
+        return self._keyframe_snapshot
 
     def get_analysis_info(self) -> Dict[str, Any]:
         """
@@ -422,7 +558,7 @@ class AnalyzerService:
 
         try:
             stats = self._api.stats
-            duration = (datetime.now() - self._current_session.start_time).total_seconds()
+            duration = self._current_session.elapsed()
 
             return {
                 "is_running": True,
@@ -470,23 +606,27 @@ class AnalyzerService:
 
     def set_status_callback(self, callback: Callable):
         """设置状态变化回调"""
+        _validate_callback(callback)
         if callback not in self._status_callbacks:
-            self._status_callbacks.append(callback)
+            self._status_callbacks = self._status_callbacks + (callback,)
 
     def set_keyframe_callback(self, callback: Callable):
         """设置关键帧回调"""
+        _validate_callback(callback)
         if callback not in self._keyframe_callbacks:
-            self._keyframe_callbacks.append(callback)
+            self._keyframe_callbacks = self._keyframe_callbacks + (callback,)
 
     def set_error_callback(self, callback: Callable):
         """设置错误回调"""
+        _validate_callback(callback)
         if callback not in self._error_callbacks:
-            self._error_callbacks.append(callback)
+            self._error_callbacks = self._error_callbacks + (callback,)
 
     def set_keyframe_video_callback(self, callback: Callable):
         """设置关键帧视频生成回调"""
+        _validate_callback(callback)
         if callback not in self._keyframe_video_callbacks:
-            self._keyframe_video_callbacks.append(callback)
+            self._keyframe_video_callbacks = self._keyframe_video_callbacks + (callback,)
 
     def set_detector_config(self, detector: str, enabled: bool = None, threshold: float = None):
         """
@@ -501,15 +641,18 @@ class AnalyzerService:
             self.logger.warning(f"Unknown detector: {detector}")
             return
 
+        config = dict(self._detector_config[detector])
         if enabled is not None:
-            self._detector_config[detector]["enabled"] = enabled
+            config["enabled"] = enabled
 
         if threshold is not None:
-            self._detector_config[detector]["threshold"] = threshold
+            config["threshold"] = threshold
 
+        # 替换整个外层字典，已入队的写入仍持有旧快照
+        self._detector_config = {**self._detector_config, detector: MappingProxyType(config)}
         self.logger.debug(f"Detector config updated: {detector} = {self._detector_config[detector]}")
 
-    def get_detector_config(self, detector: str) -> Dict[str, Any]:
+    def get_detector_config(self, detector: str) -> Mapping[str, Any]:
         """
         获取检测器配置
 
@@ -517,9 +660,9 @@ class AnalyzerService:
             detector: 检测器名称
 
         Returns:
-            dict: 检测器配置
+            Mapping: 检测器配置（只读视图）
         """
-        return self._detector_config.get(detector, {}).copy()
+        return self._detector_config.get(detector, _EMPTY_CONFIG)
 
     def start_realtime_analysis(self, recording_id: str = "") -> bool:
         """
@@ -535,37 +678,44 @@ class AnalyzerService:
                 self.logger.warning("Realtime analysis already running")
                 return True
 
-            if self._api is None:
+            if self._stopping:
+                self.logger.warning("Analysis is stopping, cannot start realtime analysis")
+                return False
+
+            api = self._api
+            if api is None:
                 self.logger.error("Analyzer API not initialized")
                 return False
 
-            try:
-                # 创建新会话
-                import uuid
-                self._current_session = AnalysisSession(
-                    session_id=str(uuid.uuid4()),
-                    recording_id=recording_id,
-                    start_time=datetime.now(),
-                    stats={"mode": "realtime"}
-                )
+            # 创建新会话并占用实时标志
+            session = AnalysisSession(
+                session_id=uuid.uuid4().hex,
+                recording_id=recording_id,
+                start_time=datetime.now(),
+                stats={"mode": "realtime"}
+            )
+            self._current_session = session
+            self._realtime_running = True
 
-                result = self._api.start_realtime_analysis()
-                
-                if result:
-                    self._realtime_running = True
-                    if self._analyzer_module and hasattr(self._analyzer_module, 'AnalysisMode'):
-                        self._analysis_mode = self._analyzer_module.AnalysisMode.REALTIME
-                    self.logger.info(f"✅ Realtime analysis started for recording: {recording_id}")
-                    return True
-                else:
-                    self.logger.error(f"Failed to start realtime analysis: {self._api.last_error}")
-                    self._current_session = None
-                    return False
+        try:
+            result = api.start_realtime_analysis()
 
-            except Exception as e:
-                self.logger.error(f"Error starting realtime analysis: {e}")
+            if result:
+                if self._analyzer_module and hasattr(self._analyzer_module, 'AnalysisMode'):
+                    self._analysis_mode = self._analyzer_module.AnalysisMode.REALTIME
+                self.logger.info(f"✅ Realtime analysis started for recording: {recording_id}")
+                return True
+            else:
+                self.logger.error(f"Failed to start realtime analysis: {api.last_error}")
+
+        except Exception as e:
+            self.logger.error(f"Error starting realtime analysis: {e}")
+
+        with self._lock:
+            self._realtime_running = False
+            if self._current_session is session:
                 self._current_session = None
-                return False
+        return False
 
     def stop_realtime_analysis(self):
         """
@@ -577,23 +727,34 @@ class AnalyzerService:
             if not self._realtime_running:
                 return
 
-            if self._api is None:
+            api = self._api
+            if api is None or self._stopping:
                 return
 
-            try:
-                self._api.stop_realtime_analysis()
-                self._realtime_running = False
-                
-                # 清理会话
-                if self._current_session:
-                    self._current_session.end_time = datetime.now()
-                    session_info = self._current_session.to_dict()
-                    self.logger.info(f"⏸️ Realtime analysis stopped. Session: {session_info['session_id']}")
-                    self._current_session = None
-                
-                self.logger.info("✅ Realtime analysis stopped successfully")
-            except Exception as e:
-                self.logger.error(f"Error stopping realtime analysis: {e}")
+            # 标记停止中，会话保持占用直到原生停止返回
+            self._realtime_running = False
+            self._stopping = True
+            session = self._current_session
+
+        try:
+            api.stop_realtime_analysis()
+
+            # 清理会话
+            if session:
+                session.finish(datetime.now())
+                session_info = session.to_dict()
+                self.logger.info(f"⏸️ Realtime analysis stopped. Session: {session_info['session_id']}")
+
+            self.logger.info("✅ Realtime analysis stopped successfully")
+        except Exception as e:
+            self.logger.error(f"Error stopping realtime analysis: {e}")
+            # 停止失败时恢复状态
+            with self._lock:
+                self._realtime_running = True
+            self._finish_stop(session, False)
+            return
+
+        self._finish_stop(session, True)
 
     def is_realtime_mode(self) -> bool:
         """
@@ -617,6 +778,7 @@ class AnalyzerService:
     def shutdown(self):
         """关闭分析服务"""
         self.stop_analysis()
+        self._stop_writer()
         self.module_manager.shutdown_analyzer()
         self._api = None
         self._current_session = None
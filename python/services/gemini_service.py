@@ -2,17 +2,42 @@
 Gemini API 调用封装组件
 管理与 Google Gemini API 的交互
 """
+import copy
 import os
 import time
 import json
+import logging
+import random
+import asyncio
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any, Optional
 from infrastructure.log_manager import get_logger
 from AiService.video_preprocessor import VideoPreprocessor
 from AiService.response_parser import ResponseParser
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """按路径与修改时间缓存解析结果；缓存的字典在实例间共享，只能复制后使用"""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class GeminiService:
     """Gemini API 服务封装"""
+
+    # 文件状态轮询：初始间隔、最大间隔（秒）与增长倍数
+    POLL_INITIAL_DELAY = 0.25
+    POLL_MAX_DELAY = 5.0
+    POLL_BACKOFF = 1.5
     model: Any
     _genai: Any
     api_key: Optional[str]
@@ -31,6 +56,7 @@ class GeminiService:
         self.model_name = model_name or self._config.get("model", {}).get("name", "gemini-2.5-flash-lite")
         self.model = None
         self._genai = None  # 增加显式初始化
+        self._generation_config: Dict[str, Any] = {}
         self.parser = ResponseParser()
 
         # C++ 模块服务引用
@@ -46,8 +72,8 @@ class GeminiService:
     def _load_config(self, config_path: str) -> Dict:
         """加载配置文件"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # 返回深拷贝，实例修改自己的配置不会影响缓存与其他实例
+            return copy.deepcopy(_load_config_cached(config_path, os.stat(config_path).st_mtime))
         except Exception as e:
             self.logger.warning(f"Failed to load config: {e}, using defaults")
             return {}
@@ -58,6 +84,8 @@ class GeminiService:
             from google import genai
             self._genai = genai.Client(api_key=self.api_key)
             self.model = self.model_name
+            # 生成配置只解析一次，每次请求复用同一对象
+            self._generation_config = self._config.get("generation_config") or {}
             self.logger.info(f"Gemini client initialized with model: {self.model_name}")
         except Exception as e:
             self.logger.error(f"Failed to initialize Gemini client: {e}")
@@ -90,9 +118,7 @@ class GeminiService:
 
         start_time = time.time()
         try:
-            result = self._retry_with_backoff(
-                lambda: self._genai.files.upload(file=video_path)
-            )
+            result = self._retry_with_backoff(self._genai.files.upload, file=video_path)
             duration = time.time() - start_time
             self.logger.info(f"Upload completed in {duration:.2f}s")
         except Exception as e:
@@ -104,27 +130,83 @@ class GeminiService:
             raise RuntimeError("Failed to upload video")
         return result.name
 
+    def _next_poll_delay(self, delay: float) -> float:
+        """本次轮询等待时间（指数退避 + 抖动，避免多个上传同时轮询）"""
+        return min(delay, self.POLL_MAX_DELAY) * (0.5 + random.random())
+
     def wait_for_file_active(self, file_name: str, timeout: int = 300) -> bool:
-        """等待文件处理完成"""
+        """等待文件处理完成（阻塞轮询，间隔指数增长）"""
         if not self._genai:
             raise RuntimeError("Gemini client not initialized")
 
         start_time = time.time()
+        delay = self.POLL_INITIAL_DELAY
         while time.time() - start_time < timeout:
-            file_info = self._genai.files.get(name=file_name)
-            if file_info.state.name == "ACTIVE":
+            state = self._genai.files.get(name=file_name).state.name
+            if state == "ACTIVE":
                 return True
-            if file_info.state.name == "FAILED":
+            if state == "FAILED":
                 self.logger.error("File processing failed")
                 return False
-            time.sleep(2)
+            time.sleep(self._next_poll_delay(delay))
+            delay *= self.POLL_BACKOFF
         self.logger.error("File processing timeout")
         return False
 
+    async def async_wait_for_file_active(self, file_name: str, timeout: int = 300) -> bool:
+        """等待文件处理完成（异步轮询，间隔指数增长，不占用工作线程）"""
+        if not self._genai:
+            raise RuntimeError("Gemini client not initialized")
+
+        start_time = time.time()
+        delay = self.POLL_INITIAL_DELAY
+        while time.time() - start_time < timeout:
+            file_info = await asyncio.to_thread(self._genai.files.get, name=file_name)
+            state = file_info.state.name
+            if state == "ACTIVE":
+                return True
+            if state == "FAILED":
+                self.logger.error("File processing failed")
+                return False
+            await asyncio.sleep(self._next_poll_delay(delay))
+            delay *= self.POLL_BACKOFF
+        self.logger.error("File processing timeout")
+        return False
+
+    def _generate_content(self, video_file, prompt: str):
+        """发送生成请求"""
+        # 添加日志：输出提示词
+        self.logger.info(f"Sending prompt (first 200 chars): {prompt[:200]}...")
+
+        self.logger.info("Calling Gemini API for content generation...")
+        response = self._genai.models.generate_content(
+            model=self.model,
+            contents=[video_file, prompt],
+            config=self._generation_config
+        )
+        self.logger.info("Received response from Gemini API")
+        return response
+
+    def _parse_response(self, response) -> Optional[Dict[str, Any]]:
+        """解析生成结果"""
+        # 响应文本只取一次，日志与解析共用
+        text = response.text
+
+        # 添加日志：输出原始响应
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Gemini raw response (first 500 chars): {text[:500]}...")
+
+        parsed_result = self.parser.parse(text)
+        if parsed_result is None:
+            self.logger.error(f"Failed to parse response. Full response: {text}")
+        else:
+            self.logger.info("Successfully parsed Gemini response")
+        return parsed_result
+
     def analyze_video(self, video_path: str, prompt: str) -> Optional[Dict[str, Any]]:
-        """分析视频"""
+        """分析视频（阻塞调用，可在任意线程中使用）"""
         self.logger.info(f"Starting video analysis for: {video_path}")
-        
+
         if not self.preprocessor.validate_video(video_path):
             self.logger.error("Video validation failed")
             return None
@@ -136,7 +218,7 @@ class GeminiService:
             self.logger.info("Uploading video to Gemini...")
             file_name = self.upload_video(video_path)
             self.logger.info(f"Video uploaded successfully: {file_name}")
-            
+
             self.logger.info("Waiting for file to become active...")
             if not self.wait_for_file_active(file_name):
                 self.logger.error("File activation timeout or failed")
@@ -144,36 +226,50 @@ class GeminiService:
             self.logger.info("File is now active")
 
             video_file = self._genai.files.get(name=file_name)
-            
-            # 添加日志：输出提示词
-            self.logger.info(f"Sending prompt (first 200 chars): {prompt[:200]}...")
-            
-            self.logger.info("Calling Gemini API for content generation...")
-            response = self._genai.models.generate_content(
-                model=self.model,
-                contents=[video_file, prompt],
-                config=self._config.get("generation_config", {})
-            )
-            self.logger.info("Received response from Gemini API")
-            
-            # 添加日志：输出原始响应
-            self.logger.info(f"Gemini raw response (first 500 chars): {response.text[:500]}...")
-            
-            parsed_result = self.parser.parse(response.text)
-            if parsed_result is None:
-                self.logger.error(f"Failed to parse response. Full response: {response.text}")
-            else:
-                self.logger.info("Successfully parsed Gemini response")
-            return parsed_result
+            return self._parse_response(self._generate_content(video_file, prompt))
+        except Exception as e:
+            self.logger.error(f"Video analysis failed: {e}")
+            return None
+
+    async def async_analyze_video(self, video_path: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        分析视频（异步）
+
+        阻塞的文件校验、上传和生成请求在线程池中执行，
+        状态轮询使用 asyncio.sleep，多个分析可共享同一事件循环。
+        """
+        self.logger.info(f"Starting video analysis for: {video_path}")
+
+        if not await asyncio.to_thread(self.preprocessor.validate_video, video_path):
+            self.logger.error("Video validation failed")
+            return None
+
+        try:
+            if not self._genai:
+                raise RuntimeError("Gemini client not initialized")
+
+            self.logger.info("Uploading video to Gemini...")
+            file_name = await asyncio.to_thread(self.upload_video, video_path)
+            self.logger.info(f"Video uploaded successfully: {file_name}")
+
+            self.logger.info("Waiting for file to become active...")
+            if not await self.async_wait_for_file_active(file_name):
+                self.logger.error("File activation timeout or failed")
+                return None
+            self.logger.info("File is now active")
+
+            video_file = await asyncio.to_thread(self._genai.files.get, name=file_name)
+            response = await asyncio.to_thread(self._generate_content, video_file, prompt)
+            return self._parse_response(response)
         except Exception as e:
             self.logger.error(f"Video analysis failed: {e}")
             return None
 
-    def _retry_with_backoff(self, func, max_retries: int = 3):
-        """指数退避重试"""
+    def _retry_with_backoff(self, func, *args, max_retries: int = 3, **kwargs):
+        """指数退避重试，参数原样传给 func"""
         for attempt in range(max_retries):
             try:
-                return func()
+                return func(*args, **kwargs)
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
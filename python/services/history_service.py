@@ -5,9 +5,11 @@
 import json
 import uuid
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, ClassVar, FrozenSet
+from functools import lru_cache
+from contextlib import contextmanager
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, replace
 
 from infrastructure.log_manager import get_logger
 from database.database_manager import DatabaseManager
@@ -17,12 +19,21 @@ from database.ai_analysis_dao import AIAnalysisDAO
 from database.timestamp_event_dao import TimestampEventDAO
 from database.key_finding_dao import KeyFindingDAO
 from database.analysis_metadata_dao import AnalysisMetadataDAO
-from database.models import Recording, KeyFrameVideo
+from database.analysis_run_dao import AnalysisRunDAO
+from database.models import Recording, KeyFrameVideo, AnalysisRun
 
 
-@dataclass
+def _load_json(path: Path) -> Any:
+    """读取旧版 JSON 文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@dataclass(slots=True)
 class RecordingRecord:
     """录制记录数据类"""
+    _FIELDS: ClassVar[FrozenSet[str]]
+
     record_id: str
     file_path: str
     start_time: str
@@ -35,17 +46,31 @@ class RecordingRecord:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            "record_id": self.record_id,
+            "file_path": self.file_path,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "file_size": self.file_size,
+            "keyframe_count": self.keyframe_count,
+            "thumbnail_path": self.thumbnail_path,
+            "notes": self.notes
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'RecordingRecord':
-        """从字典创建"""
-        return cls(**data)
+        """从字典创建，忽略未知字段"""
+        if data.keys() <= cls._FIELDS:
+            return cls(**data)
+        return cls(**{k: v for k, v in data.items() if k in cls._FIELDS})
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisRecord:
     """分析记录数据类"""
+    _FIELDS: ClassVar[FrozenSet[str]]
+
     record_id: str
     recording_id: str  # 关联的录制记录ID
     start_time: str
@@ -56,12 +81,26 @@ class AnalysisRecord:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            "record_id": self.record_id,
+            "recording_id": self.recording_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "keyframe_count": self.keyframe_count,
+            "analyzed_frames": self.analyzed_frames,
+            "results": list(self.results)
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AnalysisRecord':
-        """从字典创建"""
-        return cls(**data)
+        """从字典创建，忽略未知字段"""
+        if data.keys() <= cls._FIELDS:
+            return cls(**data)
+        return cls(**{k: v for k, v in data.items() if k in cls._FIELDS})
+
+
+RecordingRecord._FIELDS = frozenset(f.name for f in fields(RecordingRecord))
+AnalysisRecord._FIELDS = frozenset(f.name for f in fields(AnalysisRecord))
 
 
 class HistoryService:
@@ -91,82 +130,77 @@ class HistoryService:
         self.timestamp_event_dao = TimestampEventDAO(self.db_manager)
         self.key_finding_dao = KeyFindingDAO(self.db_manager)
         self.analysis_metadata_dao = AnalysisMetadataDAO(self.db_manager)
-
-        # 数据文件
-        self._recordings_file = self.data_dir / "recordings.json"
-        self._analyses_file = self.data_dir / "analyses.json"
-
-        # 内存缓存
-        self._recordings: Dict[str, RecordingRecord] = {}
-        self._analyses: Dict[str, AnalysisRecord] = {}
-
-        # 加载数据
-        self._load_data()
-
-    def _load_data(self):
-        """加载历史数据"""
-        self._load_recordings()
-        self._load_analyses()
-
-    def _load_recordings(self):
-        """加载录制记录"""
-        if not self._recordings_file.exists():
-            self.logger.info("No recordings history file found, starting fresh")
+        self.analysis_run_dao = AnalysisRunDAO(self.db_manager)
+
+        # 录制与分析记录均以数据库为准，按ID缓存查询结果，任何修改后整体失效
+        self._recording_cache = lru_cache(maxsize=1024)(self._fetch_recording)
+        self._analysis_cache = lru_cache(maxsize=1024)(self._fetch_analysis)
+        # 统计结果缓存，录制或分析记录变化时失效
+        self._statistics_cache = lru_cache(maxsize=1)(self._compute_statistics)
+
+        # 旧版文件需在首次查询数据库前合并
+        self._migrate_recordings_file()
+        self._migrate_analyses_file()
+
+    def _migrate_recordings_file(self):
+        """将旧版录制记录文件中仅存于文件的字段（备注、关键帧数）合并到数据库"""
+        source = self.data_dir / "recordings.json"
+        if not source.exists():
             return
 
         try:
-            with open(self._recordings_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            for record_data in data:
-                record = RecordingRecord.from_dict(record_data)
-                self._recordings[record.record_id] = record
-
-            self.logger.info(f"Loaded {len(self._recordings)} recording records")
+            with self.db_manager.transaction():
+                for data in _load_json(source):
+                    db_recording = self.recording_dao.get_by_id(data["record_id"])
+                    if not db_recording:
+                        continue
+                    db_recording.description = data.get("notes", "")
+                    db_recording.metadata["keyframe_count"] = data.get("keyframe_count", 0)
+                    db_recording.metadata.setdefault("end_time", data.get("end_time", ""))
+                    self.recording_dao.update(db_recording)
+
+            source.rename(source.with_name(source.name + ".migrated"))
+            self.logger.info(f"Migrated {source.name} into database")
 
         except Exception as e:
-            self.logger.error(f"Error loading recordings: {e}")
+            self.logger.error(f"Error migrating recordings file: {e}")
 
-    def _load_analyses(self):
-        """加载分析记录"""
-        if not self._analyses_file.exists():
-            self.logger.info("No analyses history file found, starting fresh")
+    def _migrate_analyses_file(self):
+        """将旧版分析记录文件导入数据库"""
+        source = self.data_dir / "analyses.json"
+        if not source.exists():
             return
 
         try:
-            with open(self._analyses_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            for record_data in data:
-                record = AnalysisRecord.from_dict(record_data)
-                self._analyses[record.record_id] = record
-
-            self.logger.info(f"Loaded {len(self._analyses)} analysis records")
-
-        except Exception as e:
-            self.logger.error(f"Error loading analyses: {e}")
-
-    def _save_recordings(self):
-        """保存录制记录"""
-        try:
-            data = [record.to_dict() for record in self._recordings.values()]
+            with self.db_manager.transaction():
+                existing = self.analysis_run_dao.get_all_ids()
+                # 逐条解析、转换、插入，不再构造中间记录列表
+                runs = (self._to_run(AnalysisRecord.from_dict(data)) for data in _load_json(source))
+                migrated = self.analysis_run_dao.create_many(
+                    run for run in runs if run.run_id not in existing
+                )
 
-            with open(self._recordings_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            source.rename(source.with_name(source.name + ".migrated"))
+            self.logger.info(f"Migrated {len(migrated)} analysis records from {source.name} into database")
 
         except Exception as e:
-            self.logger.error(f"Error saving recordings: {e}")
+            self.logger.error(f"Error migrating analyses file: {e}")
 
-    def _save_analyses(self):
-        """保存分析记录"""
-        try:
-            data = [record.to_dict() for record in self._analyses.values()]
+    @contextmanager
+    def buffered(self):
+        """批量修改上下文，可嵌套；块内的数据库写入合并为一个事务"""
+        with self.db_manager.transaction():
+            yield self
 
-            with open(self._analyses_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    def _invalidate_recordings(self):
+        """录制记录变化后清空相关缓存"""
+        self._recording_cache.cache_clear()
+        self._statistics_cache.cache_clear()
 
-        except Exception as e:
-            self.logger.error(f"Error saving analyses: {e}")
+    def _invalidate_analyses(self):
+        """分析记录变化后清空相关缓存"""
+        self._analysis_cache.cache_clear()
+        self._statistics_cache.cache_clear()
 
     # ========== 录制记录管理 ==========
 
@@ -237,33 +271,21 @@ class HistoryService:
                 self.logger.error(f"Recording record not found in database: {record_id}")
                 return False
 
+            if not duration:
+                duration = int((end_time - datetime.fromisoformat(db_recording.created_at)).total_seconds())
             db_recording.duration_seconds = duration
             db_recording.file_size_bytes = file_size
             db_recording.thumbnail_path = thumbnail_path
             db_recording.description = notes
-            db_recording.updated_at = end_time.isoformat()
             db_recording.metadata["status"] = "completed"
+            db_recording.metadata["end_time"] = end_time.isoformat()
+            db_recording.metadata["keyframe_count"] = keyframe_count
 
             # 更新数据库
             self.recording_dao.update(db_recording)
+            self._invalidate_recordings()
 
-            # 更新内存和JSON缓存
-            start_time = datetime.fromisoformat(db_recording.created_at)
-            record = RecordingRecord(
-                record_id=record_id,
-                file_path=db_recording.original_video_path,
-                start_time=db_recording.created_at,
-                end_time=db_recording.updated_at,
-                duration=duration or int((end_time - start_time).total_seconds()),
-                file_size=file_size,
-                keyframe_count=keyframe_count,
-                thumbnail_path=thumbnail_path,
-                notes=notes
-            )
-            self._recordings[record_id] = record
-            self._save_recordings()
-
-            self.logger.info(f"Updated recording in database and cache: {record_id}")
+            self.logger.info(f"Updated recording in database: {record_id}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to update recording: {e}")
@@ -288,13 +310,36 @@ class HistoryService:
         self.update_recording(record_id, end_time, file_size, duration, keyframe_count, thumbnail_path, notes)
         return record_id
 
+    @staticmethod
+    def _to_record(db_recording: Recording) -> RecordingRecord:
+        """数据库录制行 -> 录制记录（按字段顺序位置传参，列表查询时逐行调用）"""
+        metadata = db_recording.metadata
+        return RecordingRecord(
+            db_recording.record_id,
+            db_recording.original_video_path,
+            db_recording.created_at,
+            metadata.get("end_time") or db_recording.updated_at,
+            db_recording.duration_seconds,
+            db_recording.file_size_bytes,
+            metadata.get("keyframe_count", 0),
+            db_recording.thumbnail_path,
+            db_recording.description
+        )
+
+    def _fetch_recording(self, record_id: str) -> Optional[RecordingRecord]:
+        db_recording = self.recording_dao.get_by_id(record_id)
+        if not db_recording or db_recording.metadata.get("status") != "completed":
+            return None
+        return self._to_record(db_recording)
+
     def get_all_recordings(self) -> List[RecordingRecord]:
-        """获取所有录制记录"""
-        return list(self._recordings.values())
+        """获取所有已完成的录制记录"""
+        return [self._to_record(r) for r in self.recording_dao.list_all(status="completed")]
 
     def get_recording(self, record_id: str) -> Optional[RecordingRecord]:
-        """获取单个录制记录"""
-        return self._recordings.get(record_id)
+        """获取单个录制记录（返回缓存对象的副本，调用方可自由修改）"""
+        record = self._recording_cache(record_id)
+        return replace(record) if record else None
 
     def delete_recording(self, record_id: str) -> bool:
         """
@@ -306,19 +351,22 @@ class HistoryService:
         Returns:
             bool: 成功返回True
         """
-        if record_id not in self._recordings:
+        try:
+            # 关键帧视频及其分析由外键级联删除，直接关联录制的分析需单独删除
+            with self.db_manager.transaction():
+                self.ai_analysis_dao.delete_by_recording_id(record_id)
+                deleted = self.recording_dao.delete(record_id)
+                if deleted:
+                    self.analysis_run_dao.delete_by_recording_id(record_id)
+        except Exception as e:
+            self.logger.error(f"Failed to delete recording: {e}")
             return False
+        finally:
+            self._invalidate_recordings()
+            self._invalidate_analyses()
 
-        # 删除关联的分析记录
-        self._analyses = {
-            aid: arec for aid, arec in self._analyses.items()
-            if arec.recording_id != record_id
-        }
-        self._save_analyses()
-
-        # 删除录制记录
-        del self._recordings[record_id]
-        self._save_recordings()
+        if not deleted:
+            return False
 
         self.logger.info(f"Deleted recording record: {record_id}")
         return True
@@ -333,13 +381,7 @@ class HistoryService:
         Returns:
             List[RecordingRecord]: 匹配的记录列表
         """
-        keyword_lower = keyword.lower()
-
-        return [
-            record for record in self._recordings.values()
-            if keyword_lower in record.file_path.lower() or
-               keyword_lower in record.notes.lower()
-        ]
+        return [self._to_record(r) for r in self.recording_dao.search(keyword, status="completed")]
 
     def update_recording_notes(self, record_id: str, notes: str) -> bool:
         """
@@ -352,23 +394,24 @@ class HistoryService:
         Returns:
             bool: 成功返回True
         """
-        if record_id not in self._recordings:
+        try:
+            db_recording = self.recording_dao.get_by_id(record_id)
+            if not db_recording:
+                return False
+            db_recording.description = notes
+            return self.recording_dao.update(db_recording)
+        except Exception as e:
+            self.logger.error(f"Failed to update recording notes: {e}")
             return False
-
-        self._recordings[record_id].notes = notes
-        self._save_recordings()
-        return True
+        finally:
+            self._invalidate_recordings()
 
     def toggle_favorite(self, record_id: str) -> bool:
         """切换收藏状态"""
         try:
-            db_recording = self.recording_dao.get_by_id(record_id)
-            if not db_recording:
+            if not self.recording_dao.toggle_favorite(record_id):
                 return False
-            is_fav = db_recording.metadata.get("is_favorite", False)
-            db_recording.metadata["is_favorite"] = not is_fav
-            self.recording_dao.update(db_recording)
-            self.logger.info(f"Toggled favorite for {record_id}: {not is_fav}")
+            self.logger.info(f"Toggled favorite for {record_id}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to toggle favorite: {e}")
@@ -448,20 +491,16 @@ class HistoryService:
         Returns:
             str: 记录ID
         """
-        record_id = str(uuid.uuid4())
-
-        record = AnalysisRecord(
-            record_id=record_id,
+        record_id = self.analysis_run_dao.create(AnalysisRun(
+            run_id=str(uuid.uuid4()),
             recording_id=recording_id,
             start_time=start_time.isoformat(),
             end_time=end_time.isoformat(),
             keyframe_count=keyframe_count,
             analyzed_frames=analyzed_frames,
             results=results or []
-        )
-
-        self._analyses[record_id] = record
-        self._save_analyses()
+        ))
+        self._invalidate_analyses()
 
         self.logger.info(f"Added analysis record: {record_id}")
         return record_id
@@ -485,7 +524,8 @@ class HistoryService:
             keyframe_id = keyframes[0].keyframe_id if keyframes else None
             
             analysis_id = str(uuid.uuid4())
-            now = datetime.now().isoformat()
+            now_dt = datetime.now()
+            now = now_dt.isoformat()
             
             # 2. 创建主分析记录
             db_analysis = AIAnalysis(
@@ -500,11 +540,10 @@ class HistoryService:
                 started_at=now,
                 completed_at=now
             )
-            self.ai_analysis_dao.create(db_analysis)
-            
-            # 3. 保存时间轴事件
-            for event_data in result.get("timestamp_events", []):
-                event = TimestampEvent(
+
+            # 3. 时间轴事件
+            events = [
+                TimestampEvent(
                     event_id=str(uuid.uuid4()),
                     analysis_id=analysis_id,
                     timestamp_seconds=float(event_data.get("timestamp_seconds") or 0),
@@ -513,11 +552,12 @@ class HistoryService:
                     description=event_data.get("description") or "",
                     importance_score=event_data.get("importance_score") if event_data.get("importance_score") is not None else 5
                 )
-                self.timestamp_event_dao.create(event)
-            
-            # 4. 保存关键发现
-            for i, finding_data in enumerate(result.get("key_findings", [])):
-                finding = KeyFinding(
+                for event_data in result.get("timestamp_events", [])
+            ]
+
+            # 4. 关键发现
+            findings = [
+                KeyFinding(
                     finding_id=str(uuid.uuid4()),
                     analysis_id=analysis_id,
                     sequence_order=finding_data.get("sequence_order") if finding_data.get("sequence_order") is not None else i,
@@ -527,24 +567,33 @@ class HistoryService:
                     confidence_score=finding_data.get("confidence_score") if finding_data.get("confidence_score") is not None else 80,
                     related_timestamps=finding_data.get("related_timestamps") or []
                 )
-                self.key_finding_dao.create(finding)
-                
-            # 5. 保存元数据
-            for meta_data in result.get("analysis_metadata", []):
-                meta = AnalysisMetadata(
+                for i, finding_data in enumerate(result.get("key_findings", []))
+            ]
+
+            # 5. 元数据
+            metas = [
+                AnalysisMetadata(
                     metadata_id=str(uuid.uuid4()),
                     analysis_id=analysis_id,
                     key=meta_data.get("key") or "",
                     value=str(meta_data.get("value") or ""),
                     data_type=meta_data.get("data_type") or "string"
                 )
-                self.analysis_metadata_dao.create(meta)
-                
+                for meta_data in result.get("analysis_metadata", [])
+            ]
+
+            # 主记录与三张子表在同一事务中批量写入
+            with self.db_manager.transaction():
+                self.ai_analysis_dao.create(db_analysis)
+                self.timestamp_event_dao.create_many(events)
+                self.key_finding_dao.create_many(findings)
+                self.analysis_metadata_dao.create_many(metas)
+
             # 6. 同时更新内存缓存和 JSON 文件 (为了向下兼容)
             self.add_analysis(
                 recording_id=recording_id,
-                start_time=datetime.fromisoformat(now),
-                end_time=datetime.fromisoformat(now),
+                start_time=now_dt,
+                end_time=now_dt,
                 keyframe_count=len(keyframes),
                 analyzed_frames=0,
                 results=[{"markdown": result.get("summary_md", ""), "detailed": True}]
@@ -556,20 +605,43 @@ class HistoryService:
             self.logger.error(f"Failed to save detailed AI analysis: {e}")
             return False
 
+    @staticmethod
+    def _to_analysis(run: AnalysisRun) -> AnalysisRecord:
+        """数据库分析运行行 -> 分析记录（按字段顺序位置传参）"""
+        return AnalysisRecord(
+            run.run_id, run.recording_id, run.start_time, run.end_time,
+            run.keyframe_count, run.analyzed_frames, run.results
+        )
+
+    @staticmethod
+    def _to_run(record: AnalysisRecord) -> AnalysisRun:
+        """分析记录 -> 数据库分析运行行"""
+        return AnalysisRun(
+            run_id=record.record_id,
+            recording_id=record.recording_id,
+            start_time=record.start_time,
+            end_time=record.end_time,
+            keyframe_count=record.keyframe_count,
+            analyzed_frames=record.analyzed_frames,
+            results=record.results
+        )
+
+    def _fetch_analysis(self, record_id: str) -> Optional[AnalysisRecord]:
+        run = self.analysis_run_dao.get_by_id(record_id)
+        return self._to_analysis(run) if run else None
+
     def get_all_analyses(self) -> List[AnalysisRecord]:
-        """获取所有分析记录"""
-        return list(self._analyses.values())
+        """获取所有分析记录（按添加顺序）"""
+        return [self._to_analysis(run) for run in self.analysis_run_dao.get_all()]
 
     def get_analyses_for_recording(self, recording_id: str) -> List[AnalysisRecord]:
         """获取指定录制记录的所有分析"""
-        return [
-            record for record in self._analyses.values()
-            if record.recording_id == recording_id
-        ]
+        return [self._to_analysis(run) for run in self.analysis_run_dao.get_by_recording_id(recording_id)]
 
     def get_analysis(self, record_id: str) -> Optional[AnalysisRecord]:
-        """获取单个分析记录"""
-        return self._analyses.get(record_id)
+        """获取单个分析记录（返回缓存对象的副本，调用方可自由修改）"""
+        record = self._analysis_cache(record_id)
+        return replace(record, results=list(record.results)) if record else None
 
     def delete_analysis(self, record_id: str) -> bool:
         """
@@ -581,11 +653,11 @@ class HistoryService:
         Returns:
             bool: 成功返回True
         """
-        if record_id not in self._analyses:
-            return False
-
-        del self._analyses[record_id]
-        self._save_analyses()
+        try:
+            if not self.analysis_run_dao.delete(record_id):
+                return False
+        finally:
+            self._invalidate_analyses()
 
         self.logger.info(f"Deleted analysis record: {record_id}")
         return True
@@ -593,9 +665,13 @@ class HistoryService:
     # ========== 统计信息 ==========
 
     def get_statistics(self) -> Dict[str, Any]:
-        """获取统计信息"""
-        total_recordings = len(self._recordings)
-        total_analyses = len(self._analyses)
+        """获取统计信息（缓存至下一次修改）"""
+        return dict(self._statistics_cache())
+
+    def _compute_statistics(self) -> Dict[str, Any]:
+        total_recordings, total_duration, total_size, total_keyframes = \
+            self.recording_dao.aggregate_stats(status="completed")
+        total_analyses = self.analysis_run_dao.count()
 
         if total_recordings == 0:
             return {
@@ -606,10 +682,6 @@ class HistoryService:
                 "total_keyframes": 0
             }
 
-        total_duration = sum(r.duration for r in self._recordings.values())
-        total_size = sum(r.file_size for r in self._recordings.values())
-        total_keyframes = sum(r.keyframe_count for r in self._recordings.values())
-
         return {
             "total_recordings": total_recordings,
             "total_analyses": total_analyses,
@@ -628,10 +700,13 @@ class HistoryService:
             bool: 成功返回True
         """
         try:
-            self._recordings.clear()
-            self._analyses.clear()
-            self._save_recordings()
-            self._save_analyses()
+            # 关键帧视频及各分析子表由外键级联删除，单个事务内完成
+            with self.db_manager.transaction():
+                self.analysis_run_dao.delete_all()
+                self.ai_analysis_dao.delete_all()
+                self.recording_dao.delete_all()
+            self._invalidate_recordings()
+            self._invalidate_analyses()
 
             self.logger.info("Cleared all history records")
             return True
@@ -688,15 +763,11 @@ class HistoryService:
             # 获取AI分析结果 - 优先使用 keyframe_id，否则通过 recording_id 获取
             analysis = None
             if keyframe:
-                analyses = self.ai_analysis_dao.get_by_keyframe_id(keyframe.keyframe_id)
-                if analyses:
-                    analysis = analyses[0]
+                analysis = self.ai_analysis_dao.get_latest_by_keyframe_id(keyframe.keyframe_id)
             
             # 后备：直接通过 recording_id 获取分析（针对直接分析录制视频的情况）
             if not analysis:
-                analyses = self.ai_analysis_dao.get_by_recording_id(recording_id)
-                if analyses:
-                    analysis = analyses[0]
+                analysis = self.ai_analysis_dao.get_latest_by_recording_id(recording_id)
 
             if not analysis:
                 return result
@@ -706,18 +777,14 @@ class HistoryService:
 
             # 获取时间戳事件
             events = self.timestamp_event_dao.get_by_analysis_id(analysis.analysis_id)
-            for e in events:
-                mins = int(e.timestamp_seconds) // 60
-                secs = int(e.timestamp_seconds) % 60
-                result["timestamps"].append({
-                    "time": f"{mins:02d}:{secs:02d}",
-                    "description": e.description or e.title
-                })
+            result["timestamps"] = [
+                {"time": "%02d:%02d" % divmod(int(e.timestamp_seconds), 60), "description": e.description or e.title}
+                for e in events
+            ]
 
             # 获取关键发现
             findings = self.key_finding_dao.get_by_analysis_id(analysis.analysis_id)
-            for f in findings:
-                result["keyFindings"].append(f.content or f.title)
+            result["keyFindings"] = [f.content or f.title for f in findings]
 
             return result
 
@@ -728,9 +795,9 @@ class HistoryService:
     def get_rendered_html(self, recording_id: str) -> str:
         """获取已渲染的 HTML（如果存在）"""
         try:
-            analyses = self.ai_analysis_dao.get_by_recording_id(recording_id)
-            if analyses and analyses[0].rendered_html:
-                return analyses[0].rendered_html
+            analysis = self.ai_analysis_dao.get_latest_by_recording_id(recording_id)
+            if analysis and analysis.rendered_html:
+                return analysis.rendered_html
         except Exception as e:
             self.logger.error(f"Failed to get rendered HTML: {e}")
         return ""
@@ -738,9 +805,9 @@ class HistoryService:
     def save_rendered_html(self, recording_id: str, html: str) -> bool:
         """保存渲染后的 HTML"""
         try:
-            analyses = self.ai_analysis_dao.get_by_recording_id(recording_id)
-            if analyses:
-                return self.ai_analysis_dao.update_rendered_html(analyses[0].analysis_id, html)
+            analysis = self.ai_analysis_dao.get_latest_by_recording_id(recording_id)
+            if analysis:
+                return self.ai_analysis_dao.update_rendered_html(analysis.analysis_id, html)
         except Exception as e:
             self.logger.error(f"Failed to save rendered HTML: {e}")
         return False
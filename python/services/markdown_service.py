@@ -2,12 +2,16 @@
 Markdown 渲染服务 - 支持 Mermaid 图表和代码高亮
 使用专用渲染线程解决 Playwright 跨线程问题
 """
+import os
 import re
-import json
+import sys
+import html
 import base64
+import hashlib
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from queue import Queue
 
 from markdown_it import MarkdownIt
@@ -18,6 +22,83 @@ from pygments.formatters import HtmlFormatter
 from infrastructure.log_manager import get_logger
 
 
+# Mermaid 渲染页：只在渲染线程启动后加载一次，之后每批渲染仅替换容器内容
+_MERMAID_PAGE_HTML = """<!DOCTYPE html><html><head><meta charset="utf-8">
+<style>body{background:#09090b;font-family:"Microsoft YaHei",sans-serif;}</style>
+</head><body><div id="container"></div>
+<script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
+<script>
+window.mermaidReady=false;
+function waitForMermaid(){
+    if(typeof mermaid!=='undefined'){
+        mermaid.initialize({startOnLoad:false,theme:'dark',securityLevel:'loose',
+            fontFamily:'"Microsoft YaHei",sans-serif',darkMode:true});
+        window.mermaidReady=true;
+    }else{setTimeout(waitForMermaid,100);}
+}
+waitForMermaid();
+window.renderMermaidBatch=async function(codes){
+    const container=document.getElementById('container');
+    container.innerHTML='';
+    const nodes=codes.map(function(code){
+        const el=document.createElement('pre');
+        el.className='mermaid';
+        el.innerHTML=code;
+        container.appendChild(el);
+        return el;
+    });
+    let error=null;
+    try{await mermaid.run({nodes:nodes,suppressErrors:true});}
+    catch(e){error=e.message;}
+    const svgs=nodes.map(function(el){
+        const svg=el.querySelector('svg');
+        return svg&&svg.getAttribute('aria-roledescription')!=='error'?svg.outerHTML:null;
+    });
+    return{svgs:svgs,error:error};
+};
+</script></body></html>"""
+
+
+# 应用根目录（与 main.py 一致，打包后为解压目录）
+_APP_ROOT = Path(sys._MEIPASS) if getattr(sys, 'frozen', False) else Path(__file__).resolve().parent.parent.parent
+
+
+def _digest(text: str) -> bytes:
+    """内容寻址缓存键"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class _LRUCache:
+    """线程安全的定长 LRU 缓存"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: str):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: bytes):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
 class QMLCodeFormatter(HtmlFormatter):
     """适配 QML RichText 的代码高亮格式化器"""
     def __init__(self, **options):
@@ -34,6 +115,11 @@ class QMLCodeFormatter(HtmlFormatter):
 class MermaidRenderThread(threading.Thread):
     """专用 Mermaid 渲染线程 - 持有 Playwright 实例"""
 
+    # 转义后的 <br> 换行标签还原
+    _BR_RE = re.compile(r'&lt;br\s*/?&gt;', re.IGNORECASE)
+    # 每段图表的等待上限（秒）
+    RENDER_TIMEOUT = 30
+
     def __init__(self):
         super().__init__(daemon=True)
         self._request_queue = Queue()
@@ -50,13 +136,11 @@ class MermaidRenderThread(threading.Thread):
                 request = self._request_queue.get(timeout=1.0)
                 if request is None:  # 停止信号
                     break
-                code, result_event, result_holder = request
+                codes, result_event, result_holder = request
                 try:
-                    svg = self._render_mermaid(code)
-                    result_holder['result'] = svg
+                    result_holder['result'] = self._render_mermaid_batch(codes)
                 except Exception as e:
                     self.logger.error(f"Mermaid render error: {e}")
-                    result_holder['result'] = None
                 finally:
                     result_event.set()
             except:
@@ -70,71 +154,53 @@ class MermaidRenderThread(threading.Thread):
                 from playwright.sync_api import sync_playwright
                 self._playwright = sync_playwright().start()
                 self._browser = self._playwright.chromium.launch(headless=True)
-                self._page = self._browser.new_page()
+                page = self._browser.new_page()
+                page.set_content(_MERMAID_PAGE_HTML)
+                page.wait_for_function("window.mermaidReady===true", timeout=10000)
+                self._page = page
                 self.logger.info("Playwright initialized in render thread")
             except Exception as e:
                 self.logger.error(f"Failed to init Playwright: {e}")
+                # 释放已启动的部分，下次渲染时重新初始化
+                self._cleanup()
                 return None
         return self._page
 
-    def _render_mermaid(self, code: str) -> Optional[str]:
-        """渲染 Mermaid 为 base64 SVG"""
+    def _render_mermaid_batch(self, codes: List[str]) -> List[Optional[str]]:
+        """在一次页面调用中渲染多段 Mermaid，返回对应的 SVG 文本（失败项为 None）"""
         page = self._get_page()
         if not page:
-            return None
-
-        html_content = """<!DOCTYPE html><html><head><meta charset="utf-8">
-<style>body{background:#09090b;font-family:"Microsoft YaHei",sans-serif;}</style>
-</head><body><pre id="container" class="mermaid"></pre>
-<script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
-<script>
-window.mermaidReady=false;
-function waitForMermaid(){
-    if(typeof mermaid!=='undefined'){
-        mermaid.initialize({startOnLoad:false,theme:'dark',securityLevel:'loose',
-            fontFamily:'"Microsoft YaHei",sans-serif',darkMode:true});
-        window.mermaidReady=true;
-    }else{setTimeout(waitForMermaid,100);}
-}
-waitForMermaid();
-window.setMermaidCode=async function(code){
-    try{document.getElementById('container').innerHTML=code;await mermaid.run();return{success:true};}
-    catch(e){return{success:false,error:e.message};}
-};
-</script></body></html>"""
+            return [None] * len(codes)
 
-        page.set_content(html_content)
-        page.wait_for_function("window.mermaidReady===true", timeout=10000)
+        processed = [self._BR_RE.sub('<br/>', html.escape(code, quote=False)) for code in codes]
+        result = page.evaluate("codes => window.renderMermaidBatch(codes)", processed)
+        if result.get('error'):
+            self.logger.error(f"Mermaid JS error: {result['error']}")
+        return [self._normalize_svg(svg) for svg in result.get('svgs') or [None] * len(codes)]
 
-        processed = code.replace("<", "&lt;").replace(">", "&gt;")
-        processed = re.sub(r'&lt;br\s*/?&gt;', '<br/>', processed, flags=re.IGNORECASE)
-
-        result = page.evaluate(f"window.setMermaidCode({json.dumps(processed)})")
-        if not result.get('success', True):
-            self.logger.error(f"Mermaid JS error: {result.get('error')}")
-            return None
-
-        page.wait_for_selector(".mermaid svg", state="visible", timeout=15000)
-        page.wait_for_timeout(300)
-
-        svg = page.locator(".mermaid svg").first.evaluate("el=>el.outerHTML")
+    @staticmethod
+    def _normalize_svg(svg: Optional[str]) -> Optional[str]:
+        """补全命名空间并替换 XML 不识别的实体，使 SVG 可独立加载"""
         if not svg or len(svg) < 100:
             return None
 
         if 'xmlns="http://www.w3.org/2000/svg"' not in svg:
             svg = svg.replace('<svg', '<svg xmlns="http://www.w3.org/2000/svg"', 1)
-        svg = svg.replace('&nbsp;', '&#160;')
+        return svg.replace('&nbsp;', '&#160;')
 
-        b64 = base64.b64encode(svg.encode('utf-8')).decode('utf-8')
-        return f'<img src="data:image/svg+xml;base64,{b64}" width="100%" />'
+    def render_batch(self, codes: List[str]) -> List[Optional[str]]:
+        """线程安全的批量渲染请求"""
+        if not codes:
+            return []
+        result_event = threading.Event()
+        result_holder = {'result': [None] * len(codes)}
+        self._request_queue.put((codes, result_event, result_holder))
+        result_event.wait(timeout=self.RENDER_TIMEOUT * len(codes))
+        return result_holder['result']
 
     def render(self, code: str) -> Optional[str]:
         """线程安全的渲染请求"""
-        result_event = threading.Event()
-        result_holder = {'result': None}
-        self._request_queue.put((code, result_event, result_holder))
-        result_event.wait(timeout=30)
-        return result_holder['result']
+        return self.render_batch([code])[0]
 
     def stop(self):
         """停止渲染线程"""
@@ -147,6 +213,7 @@ window.setMermaidCode=async function(code){
             self._browser.close()
         if self._playwright:
             self._playwright.stop()
+        self._playwright = self._browser = self._page = None
         self.logger.info("MermaidRenderThread cleanup done")
 
 
@@ -156,6 +223,18 @@ class MarkdownService:
     _instance = None
     _lock = threading.Lock()
 
+    # Mermaid 代码块
+    _MERMAID_RE = re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL)
+
+    # 渲染结果缓存容量（按内容摘要寻址）
+    SVG_CACHE_SIZE = 256
+    HTML_CACHE_SIZE = 128
+    # 样式或渲染流程变化时递增，使旧的 HTML 缓存失效
+    RENDER_VERSION = "3"
+    # 渲染出的 SVG 文件目录（按源码摘要命名，跨进程复用）及文件数上限（按修改时间淘汰）
+    SVG_CACHE_DIR = _APP_ROOT / "data" / "mermaid_cache"
+    SVG_CACHE_MAX_FILES = 512
+
     def __new__(cls):
         with cls._lock:
             if cls._instance is None:
@@ -172,41 +251,144 @@ class MarkdownService:
         self.md = MarkdownIt("commonmark", {"html": True, "linkify": True})
         self._setup_highlight()
 
+        self._svg_cache = _LRUCache(self.SVG_CACHE_SIZE)
+        # 目录在首次写入 SVG 时创建
+        self._svg_dir = self.SVG_CACHE_DIR
+        self._svg_dir_ready = False
+        self._html_cache = _LRUCache(self.HTML_CACHE_SIZE)
+
         self._render_thread = MermaidRenderThread()
         self._render_thread.start()
         self.logger.info("MarkdownService initialized")
 
     def _setup_highlight(self):
-        """配置代码高亮"""
+        """配置代码高亮（格式化器与词法分析器只创建一次）"""
+        formatter = QMLCodeFormatter(style="monokai", nowrap=True)
+        text_lexer = TextLexer()
+        lexers = {}
+
+        def get_lexer(lang):
+            lexer = lexers.get(lang)
+            if lexer is None:
+                try:
+                    lexer = get_lexer_by_name(lang)
+                except:
+                    lexer = text_lexer
+                lexers[lang] = lexer
+            return lexer
+
         def highlight_code(code, lang, _attrs):
-            try:
-                lexer = get_lexer_by_name(lang) if lang else TextLexer()
-            except:
-                lexer = TextLexer()
-            return highlight(code, lexer, QMLCodeFormatter(style="monokai", nowrap=True))
+            return highlight(code, get_lexer(lang) if lang else text_lexer, formatter)
         self.md.options["highlight"] = highlight_code
 
-    def _process_mermaid(self, markdown: str) -> str:
-        """处理 Mermaid 代码块"""
-        pattern = r'```mermaid\s*\n(.*?)\n```'
+    def _process_mermaid(self, markdown: str) -> Tuple[str, bool]:
+        """处理 Mermaid 代码块，返回 (处理后文本, 是否全部渲染成功)"""
+        # 绝大多数文本不含图表，先做子串判断再跑正则
+        if '```mermaid' not in markdown:
+            return markdown, True
+        codes = [code.strip() for code in self._MERMAID_RE.findall(markdown)]
+        if not codes:
+            return markdown, True
+        svgs = iter(self._render_svgs(codes))
+        failed = False
 
         def replace(match):
-            code = match.group(1).strip()
-            svg = self._render_thread.render(code)
+            nonlocal failed
+            svg = next(svgs)
             if svg:
                 return f'\n{svg}\n'
-            return f'<table width="100%" bgcolor="#27272a"><tr><td><pre style="color:#a1a1aa;">{code}</pre></td></tr></table>'
-
-        return re.sub(pattern, replace, markdown, flags=re.DOTALL)
+            failed = True
+            code = match.group(1).strip()
+            return f'<table width="100%" bgcolor="#27272a"><tr><td><pre style="color:#a1a1aa;">{html.escape(code, quote=False)}</pre></td></tr></table>'
+
+        return self._MERMAID_RE.sub(replace, markdown), not failed
+
+    def _render_svgs(self, codes: List[str]) -> List[Optional[str]]:
+        """渲染多段 Mermaid 源码为 img 标签：命中内存或磁盘缓存的直接复用，其余合并为一次批量渲染"""
+        # 键含渲染版本，转义规则变化后旧的 SVG 文件不再命中
+        keys = [_digest(self.RENDER_VERSION + code) for code in codes]
+        imgs = [self._svg_cache.get(key) for key in keys]
+        missing = []
+        for i, img in enumerate(imgs):
+            if img is not None:
+                continue
+            path = self._svg_path(keys[i])
+            try:
+                # 刷新修改时间，淘汰时按最近使用顺序保留
+                os.utime(path)
+            except OSError:
+                missing.append(i)
+                continue
+            imgs[i] = self._img_tag(path)
+            self._svg_cache.put(keys[i], imgs[i])
+        if missing:
+            rendered = self._render_thread.render_batch([codes[i] for i in missing])
+            for i, svg in zip(missing, rendered):
+                if svg:
+                    imgs[i] = self._store_svg(keys[i], svg)
+                    self._svg_cache.put(keys[i], imgs[i])
+        return imgs
+
+    def _svg_path(self, key: bytes) -> Path:
+        return self._svg_dir / f"{key.hex()}.svg"
+
+    @staticmethod
+    def _img_tag(path: Path) -> str:
+        return f'<img src="{path.as_uri()}" width="100%" />'
+
+    def _store_svg(self, key: bytes, svg: str) -> str:
+        """写入 SVG 文件并返回引用它的 img 标签；写盘失败时退回内嵌 base64"""
+        path = self._svg_path(key)
+        try:
+            if not self._svg_dir_ready:
+                self._svg_dir.mkdir(parents=True, exist_ok=True)
+                self._svg_dir_ready = True
+            # 先写临时文件再原子替换，避免并发渲染读到半个文件
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_text(svg, encoding='utf-8')
+            os.replace(tmp, path)
+            self._prune_svg_dir()
+            return self._img_tag(path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write SVG cache file: {e}")
+            b64 = base64.b64encode(svg.encode('utf-8')).decode('ascii')
+            return f'<img src="data:image/svg+xml;base64,{b64}" width="100%" />'
+
+    def _prune_svg_dir(self):
+        """SVG 文件超过上限时删除最久未使用的；引用被删文件的内存缓存一并失效"""
+        with os.scandir(self._svg_dir) as it:
+            entries = [(entry.stat().st_mtime, entry.name) for entry in it if entry.name.endswith(".svg")]
+        excess = len(entries) - self.SVG_CACHE_MAX_FILES
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, name in entries[:excess]:
+            try:
+                os.remove(self._svg_dir / name)
+            except OSError:
+                continue
+            try:
+                self._svg_cache.discard(bytes.fromhex(name[:-4]))
+            except ValueError:
+                pass
+        # 已缓存的 HTML 可能引用被删除的文件
+        self._html_cache.clear()
 
     def render(self, raw_md: str) -> str:
         """渲染 Markdown 为 HTML"""
         if not raw_md:
             return ""
+        key = _digest(self.RENDER_VERSION + raw_md)
+        rendered = self._html_cache.get(key)
+        if rendered is not None:
+            return rendered
         try:
-            processed = self._process_mermaid(raw_md)
-            body = self.md.render(processed)
-            return f"{self._get_style()}{body}"
+            processed, complete = self._process_mermaid(raw_md)
+            rendered = f"{self._get_style()}{self.md.render(processed)}"
+            # 有图表渲染失败时不缓存，下次重试
+            if complete:
+                self._html_cache.put(key, rendered)
+            return rendered
         except Exception as e:
             self.logger.error(f"Render failed: {e}")
             return f"<p style='color:#ef4444;'>渲染失败: {e}</p>"
@@ -2,11 +2,19 @@
 录制服务
 封装录制业务逻辑，管理录制会话
 """
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Mapping, Tuple
+from types import MappingProxyType
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
-import uuid
+import asyncio
+import copy
+import logging
+import operator
+import queue
 import threading
+import time
+import uuid
 
 from infrastructure.process_manager import ModuleManager, ProcessStatus
 from infrastructure.log_manager import get_logger
@@ -17,31 +25,94 @@ except ImportError:
     # 如果模块还未构建，使用占位符
     RecorderMode = None
 
+try:
+    # C 实现的可重入锁，无竞争时加锁开销远低于标准库锁
+    from fastrlock.rlock import FastRLock as _StateLock
+except ImportError:
+    _StateLock = threading.RLock
+
+
+# 录制器状态名 -> 模块管理器状态（按名称精确匹配）
+_STATUS_MAP = {
+    "IDLE": ProcessStatus.STOPPED,
+    "RECORDING": ProcessStatus.RUNNING,
+    "PAUSED": ProcessStatus.PAUSED,
+    "ERROR": ProcessStatus.ERROR,
+}
+
+# 原生调用后台线程：待执行调用的队列上限与停止信号
+_IO_QUEUE_SIZE = 8
+_IO_STOP = object()
+
+# 录制信息快照的有效期（纳秒），期间多处轮询共用一次原生统计读取
+_INFO_TTL_NS = 16_000_000
+
+# 原生统计对象字段、缺省值及会话统计中对应的键（三者按位置一一对应）
+_STATS_FIELDS = ("frame_count", "encoded_count", "dropped_count", "file_size_bytes", "current_fps", "duration_seconds")
+_STATS_DEFAULTS = (0, 0, 0, 0, 0.0, 0.0)
+_SESSION_STATS_KEYS = ("frame_count", "encoded_count", "dropped_count", "file_size", "current_fps", "duration")
+_get_stats_fields = operator.attrgetter(*_STATS_FIELDS)
+
+# 会话初始统计信息（只读，所有新会话共享）
+_DEFAULT_STATS: Mapping[str, Any] = MappingProxyType(dict(zip(_SESSION_STATS_KEYS, _STATS_DEFAULTS)))
+
+
+def _file_timestamp(now: datetime) -> str:
+    """YYYYmmdd_HHMMSS 文件名时间戳（直接拼接字段，不走 strftime 格式解析）"""
+    return f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+
+
+def _read_stats(stats) -> tuple:
+    """一次取出原生统计对象的各字段；缺字段时逐项回退缺省值"""
+    try:
+        return _get_stats_fields(stats)
+    except AttributeError:
+        return tuple(getattr(stats, name, default) for name, default in zip(_STATS_FIELDS, _STATS_DEFAULTS))
+
 
 class RecordingSession:
     """录制会话数据类"""
 
+    __slots__ = ("session_id", "output_path", "start_time", "end_time", "start_monotonic_ns", "stats")
+
     def __init__(self, output_path: str):
+        # 作为录制记录 ID，与数据库其他记录 ID 保持相同格式
         self.session_id = str(uuid.uuid4())
         self.output_path = output_path
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
-        self.stats: Dict[str, Any] = {
-            "frame_count": 0,
-            "encoded_count": 0,
-            "dropped_count": 0,
-            "file_size": 0,
-            "duration": 0.0
-        }
+        self.start_monotonic_ns = 0
+        # 统计信息为只读快照，只整体替换，不原地修改
+        self.stats: Mapping[str, Any] = _DEFAULT_STATS
+
+    def begin(self):
+        """记录开始时间（墙钟用于序列化，单调时钟用于计算时长）"""
+        self.start_time = datetime.now()
+        self.start_monotonic_ns = time.monotonic_ns()
+
+    def elapsed(self) -> float:
+        """会话已持续的秒数（单调时钟）"""
+        return (time.monotonic_ns() - self.start_monotonic_ns) / 1e9
+
+    def update_stats(self, stats: Dict[str, Any]):
+        """以新字典整体替换统计快照（调用方不再修改该字典）"""
+        self.stats = MappingProxyType(stats)
+
+    def capture_stats(self, native_stats):
+        """一次读取原生统计对象，按固定键生成快照；原生未提供时长时使用会话时长"""
+        stats = dict(zip(_SESSION_STATS_KEYS, _read_stats(native_stats)))
+        if not stats["duration"]:
+            stats["duration"] = self.elapsed()
+        self.update_stats(stats)
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
+        """转换为字典（stats 为只读快照，直接共享）"""
         return {
             "session_id": self.session_id,
             "output_path": self.output_path,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
-            "stats": self.stats.copy()
+            "stats": self.stats
         }
 
 
@@ -64,20 +135,36 @@ class RecorderService:
         # 录制器API
         self._api = None
         self._recorder_module = None
+        # 初始化时生成的配置模板，每次开始录制复制一份再修改，模板本身保持不变
+        self._config_template = None
 
         # 当前会话
         self._current_session: Optional[RecordingSession] = None
+        # 对外发布的 (会话, 是否录制中) 快照，整体替换，读取方无需加锁
+        self._state: tuple = (None, False)
+        # 最近一次录制信息：(生成时间 ns, 所属会话, 信息字典)
+        self._info_cache: tuple = (0, None, None)
 
-        # 回调函数
-        self._status_callbacks = []
-        self._progress_callbacks = []
-        self._error_callbacks = []
+        # 回调函数（不可变元组，注册时整体替换，分发时直接读取快照）
+        self._status_callbacks: tuple = ()
+        self._progress_callbacks: tuple = ()
+        self._error_callbacks: tuple = ()
 
-        # 状态锁
-        self._lock = threading.Lock()
+        # 状态锁（未安装 fastrlock 时退回标准库可重入锁，两者语义一致）
+        self._lock = _StateLock()
+
+        # 阻塞原生调用（停止/暂停/恢复）的后台线程，按提交顺序执行
+        self._io_queue: queue.Queue = queue.Queue(maxsize=_IO_QUEUE_SIZE)
+        self._io_thread: Optional[threading.Thread] = None
 
         # 输出目录配置
         self._default_output_dir = Path.home() / "Videos" / "ScreenRecordings"
+        # 已创建过的输出目录，目录设置变化时才重新创建
+        self._output_dir_ready: Optional[Path] = None
+        # 用户设置的目录字符串及其 Path，设置未变时复用
+        self._output_dir_cache: Tuple[Optional[str], Optional[Path]] = (None, None)
+        # 上一次生成的文件名时间戳及同一秒内的序号
+        self._file_stamp: Tuple[Optional[str], int] = (None, 0)
 
         # 分析服务引用（用于SNAPSHOT模式实时分析）
         from services.analyzer_service import AnalyzerService
@@ -88,6 +175,11 @@ class RecorderService:
 
         # 缓存的录制模式（解决API未初始化时设置模式的时序问题）
         self._pending_mode = None
+        # 设置模式时预先算好是否为SNAPSHOT，热路径上不再做枚举比较
+        self._mode_is_snapshot: bool = False
+
+        # API 对象及其 graceful_stop 探测结果（API 类型固定，按对象缓存一次）
+        self._graceful_stop_cache: Tuple[Any, Optional[Callable[[int], Any]]] = (None, None)
 
         # 设置视图模型引用（用于获取用户配置）
         self._settings_viewmodel = None
@@ -118,10 +210,17 @@ class RecorderService:
             if self._api is None:
                 self.logger.error("Failed to create recorder API")
                 return False
+            self._config_template = config
 
             # 设置内部状态回调
             self._setup_internal_callbacks()
 
+            # 预先创建输出目录，开始录制时无需再访问文件系统
+            try:
+                self._ensure_output_dir(self._output_dir())
+            except OSError as e:
+                self.logger.warning(f"Failed to create output directory: {e}")
+
             self.logger.info("RecorderService initialized successfully")
             return True
 
@@ -134,39 +233,39 @@ class RecorderService:
         if self._api is None:
             return
 
-        def on_status_change(status):
-            """处理状态变化"""
-            self.logger.debug(f"Recorder status changed: {status}")
-
-            # 更新模块管理器状态
-            if hasattr(status, 'name'):
-                if 'IDLE' in status.name:
-                    self.module_manager.set_recorder_status(ProcessStatus.STOPPED)
-                elif 'RECORDING' in status.name:
-                    self.module_manager.set_recorder_status(ProcessStatus.RUNNING)
-                elif 'PAUSED' in status.name:
-                    self.module_manager.set_recorder_status(ProcessStatus.PAUSED)
-                elif 'ERROR' in status.name:
-                    self.module_manager.set_recorder_status(ProcessStatus.ERROR)
-
-            # 通知外部回调
-            for callback in self._status_callbacks:
-                try:
-                    callback(status)
-                except Exception as e:
-                    self.logger.error(f"Error in status callback: {e}")
-
-        def on_error(error_msg):
-            """处理错误"""
-            self.logger.error(f"Recorder error: {error_msg}")
-            for callback in self._error_callbacks:
-                try:
-                    callback(error_msg)
-                except Exception as e:
-                    self.logger.error(f"Error in error callback: {e}")
-
-        self._api.set_status_callback(on_status_change)
-        self._api.set_error_callback(on_error)
+        self._api.set_status_callback(self._on_status_change)
+        self._api.set_error_callback(self._on_error)
+
+    def _on_status_change(self, status):
+        """处理状态变化（原生录制线程回调）"""
+        # 原生线程高频回调：未开启 DEBUG 时不格式化状态对象
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Recorder status changed: %s", status)
+
+        # 更新模块管理器状态
+        process_status = _STATUS_MAP.get(getattr(status, 'name', None))
+        if process_status is not None:
+            self.module_manager.set_recorder_status(process_status)
+
+        # 通知外部回调（无订阅者时直接返回）
+        snapshot = self._status_callbacks
+        if not snapshot:
+            return
+        for callback in snapshot:
+            try:
+                callback(status)
+            except Exception as e:
+                self.logger.error(f"Error in status callback: {e}")
+
+    def _on_error(self, error_msg):
+        """处理错误（原生录制线程回调）"""
+        self.logger.error(f"Recorder error: {error_msg}")
+        snapshot = self._error_callbacks
+        for callback in snapshot:
+            try:
+                callback(error_msg)
+            except Exception as e:
+                self.logger.error(f"Error in error callback: {e}")
 
     def start_recording(self, output_path: Optional[str] = None) -> bool:
         """
@@ -178,89 +277,178 @@ class RecorderService:
         Returns:
             bool: 成功返回True
         """
-        recording_started = False
+        # 生成输出路径
+        if output_path is None:
+            try:
+                output_dir = self._output_dir()
+                self._ensure_output_dir(output_dir)
+            except Exception as e:
+                self.logger.error(f"Error starting recording: {e}")
+                return False
+            output_path = str(output_dir / f"recording_{self._next_file_stamp()}.mp4")
+
+        # 锁内只占用会话，数据库写入与原生调用在锁外执行
+        reserved = self._reserve_session(output_path)
+        if reserved is None:
+            return False
+        session, api, template = reserved
+        record_id = session.session_id
+
+        try:
+            # 预创建数据库记录
+            if self._history_service:
+                self._history_service.start_recording(
+                    file_path=output_path,
+                    start_time=session.start_time,
+                    record_id=record_id
+                )
+
+            # 复制配置模板，输出路径与用户设置只作用于本次录制
+            config = copy.copy(template)
+            config.video.output_file_path = output_path
+
+            # 应用用户设置到配置
+            if self._settings_viewmodel:
+                self._settings_viewmodel.apply_to_recorder_config(config)
+
+            # 初始化并启动
+            api.initialize(config)
+
+            # 应用缓存的录制模式（解决时序问题）
+            if self._pending_mode is not None:
+                api.set_recording_mode(self._pending_mode)
+                self.logger.info(f"Applied pending recording mode: {self._mode_name()}")
+
+            result = api.start()
+
+            if not result:
+                self.logger.error(f"Failed to start recording: {api.last_error}")
+                self._abandon_session(session)
+                return False
+
+        except Exception as e:
+            self.logger.error(f"Error starting recording: {e}")
+            self._abandon_session(session)
+            return False
+
+        # 启动成功后才对外发布为录制中
+        self._state = (session, True)
+        self.logger.info(f"Recording started: {output_path}")
+
+        # SNAPSHOT模式：启动实时分析
+        if self._mode_is_snapshot and self._auto_enable_realtime and self._analyzer_service:
+            self._analyzer_service.start_realtime_analysis(record_id)
+            self.logger.info(f"SNAPSHOT mode: Started realtime analysis for recording {record_id}")
+
+        return True
+
+    def _output_dir(self) -> Path:
+        """当前输出目录：优先使用用户设置的目录"""
+        if self._settings_viewmodel:
+            value = self._settings_viewmodel.outputDir
+            cached_value, cached_dir = self._output_dir_cache
+            if value != cached_value:
+                cached_dir = Path(value)
+                self._output_dir_cache = (value, cached_dir)
+            return cached_dir
+        return self._default_output_dir
+
+    def _next_file_stamp(self) -> str:
+        """文件名时间戳；同一秒内再次生成时追加序号，避免覆盖上一个文件"""
+        stamp = _file_timestamp(datetime.now())
+        last_stamp, count = self._file_stamp
+        count = count + 1 if stamp == last_stamp else 0
+        self._file_stamp = (stamp, count)
+        return f"{stamp}_{count}" if count else stamp
+
+    def _ensure_output_dir(self, output_dir: Path):
+        """输出目录与上次创建的不同时才创建"""
+        if output_dir is not self._output_dir_ready and output_dir != self._output_dir_ready:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = output_dir
+
+    def _reserve_session(self, output_path: str) -> Optional[tuple]:
+        """
+        在锁内检查并占用当前会话
+
+        Returns:
+            tuple: 占用成功返回 (会话, API, 配置模板)，已有会话或API未初始化返回None
+        """
         with self._lock:
             if self._current_session is not None:
                 self.logger.warning("Recording already in progress")
-                return False
+                return None
 
-            if self._api is None:
+            # API 与配置模板在 initialize 中一并设置，锁内只需检查一次
+            api = self._api
+            config = self._config_template
+            if api is None or config is None:
                 self.logger.error("Recorder API not initialized")
-                return False
+                return None
 
-            try:
-                # 生成输出路径
-                if output_path is None:
-                    # 优先使用用户设置的输出目录
-                    if self._settings_viewmodel:
-                        output_dir = Path(self._settings_viewmodel.outputDir)
-                    else:
-                        output_dir = self._default_output_dir
-                    output_dir.mkdir(parents=True, exist_ok=True)
-
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    output_path = str(output_dir / f"recording_{timestamp}.mp4")
-
-                # 创建会话
-                self._current_session = RecordingSession(output_path)
-                self._current_session.start_time = datetime.now()
-
-                # 预创建数据库记录
-                if self._history_service:
-                    self._history_service.start_recording(
-                        file_path=output_path,
-                        start_time=self._current_session.start_time,
-                        record_id=self._current_session.session_id
-                    )
-
-                # 更新配置的输出路径
-                if self._recorder_module is None:
-                    self.logger.error("Recorder module not initialized")
-                    return False
+            session = self._current_session = RecordingSession(output_path)
+        session.begin()
+        return session, api, config
 
-                config = self._recorder_module.default_recorder_config()
-                config.video.output_file_path = output_path
+    def _unpublish_state(self):
+        """撤下对外发布的录制状态（调用方持有 self._lock）"""
+        self._state = (None, False)
+        self._info_cache = (0, None, None)
 
-                # 应用用户设置到配置
-                if self._settings_viewmodel:
-                    self._settings_viewmodel.apply_to_recorder_config(config)
+    def _detach_session(self) -> Optional[RecordingSession]:
+        """摘下当前会话并清空对外状态（调用方持有 self._lock）"""
+        session = self._current_session
+        self._unpublish_state()
+        self._current_session = None
+        return session
 
-                # 初始化并启动
-                if self._api is None:
-                    self.logger.error("Recorder API not initialized")
-                    return False
+    def _abandon_session(self, session: RecordingSession):
+        """启动失败时撤销占用的会话"""
+        with self._lock:
+            if self._current_session is session:
+                self._detach_session()
 
-                self._api.initialize(config)
+    def _take_active_session(self) -> Optional[tuple]:
+        """
+        在锁内将录制中的会话标记为停止中，防止并发重复停止
+        会话仍占用 _current_session，原生停止返回前新的录制无法开始
 
-                # 应用缓存的录制模式（解决时序问题）
-                if self._pending_mode is not None:
-                    self._api.set_recording_mode(self._pending_mode)
-                    mode_name = "SNAPSHOT" if self._pending_mode == RecorderMode.SNAPSHOT else "VIDEO"
-                    self.logger.info(f"Applied pending recording mode: {mode_name}")
+        Returns:
+            tuple: (会话, API)，无录制中会话或API未初始化返回None
+        """
+        with self._lock:
+            session, active = self._state
+            if not active:
+                self.logger.warning("No active recording session")
+                return None
 
-                result = self._api.start()
+            api = self._api
+            if api is None:
+                self.logger.error("Recorder API not initialized")
+                return None
 
-                if result:
-                    self.logger.info(f"Recording started: {output_path}")
-                    recording_started = True
-                else:
-                    self.logger.error(f"Failed to start recording: {self._api.last_error}")
-                    self._current_session = None
-                    return False
+            self._unpublish_state()
+            return session, api
 
-            except Exception as e:
-                self.logger.error(f"Error starting recording: {e}")
+    def _release_session(self, session: RecordingSession):
+        """原生停止完成后释放会话占用"""
+        with self._lock:
+            if self._current_session is session:
                 self._current_session = None
-                return False
 
-        # SNAPSHOT模式：启动实时分析（在锁外调用，避免死锁）
-        if recording_started and self._pending_mode == RecorderMode.SNAPSHOT and self._auto_enable_realtime and self._analyzer_service:
-            # 获取录制 ID
-            record_id = self._current_session.session_id if self._current_session else ""
-            self._analyzer_service.start_realtime_analysis(record_id)
-            self.logger.info(f"SNAPSHOT mode: Started realtime analysis for recording {record_id}")
+    def _graceful_stop_of(self, api) -> Optional[Callable[[int], Any]]:
+        """返回 API 的 graceful_stop 方法（不支持时为None），同一API只探测一次"""
+        cached_api, graceful_stop = self._graceful_stop_cache
+        if cached_api is not api:
+            graceful_stop = getattr(api, 'graceful_stop', None)
+            self._graceful_stop_cache = (api, graceful_stop)
+        return graceful_stop
 
-        return recording_started
+    def _restore_session(self, session: RecordingSession):
+        """停止失败时恢复会话"""
+        with self._lock:
+            if self._current_session is session:
+                self._state = (session, True)
 
     def stop_recording(self) -> bool:
         """
@@ -269,70 +457,63 @@ class RecorderService:
         Returns:
             bool: 成功返回True
         """
-        with self._lock:
-            if self._current_session is None:
-                self.logger.warning("No active recording session")
-                return False
-
-            if self._api is None:
-                self.logger.error("Recorder API not initialized")
-                return False
+        # 锁内只将会话标记为停止中，原生停止与数据库写入在锁外执行
+        taken = self._take_active_session()
+        if taken is None:
+            return False
+        session, api = taken
 
-            try:
-                # 优先尝试优雅停止，等待 AI 分析和关键帧同步
-                # 注意：必须先 graceful_stop 发送 STOP_SIGNAL，让 AI 处理完剩余帧
-                # 然后再停止 AI 分析，否则 AI 收不到信号，关键帧无法编码
-                if hasattr(self._api, 'graceful_stop'):
-                    self.logger.info("🎬 Stopping recording gracefully...")
-                    self._api.graceful_stop(5000)  # 5秒超时
-                else:
-                    self._api.stop()
+        try:
+            # 优先尝试优雅停止，等待 AI 分析和关键帧同步
+            # 注意：必须先 graceful_stop 发送 STOP_SIGNAL，让 AI 处理完剩余帧
+            # 然后再停止 AI 分析，否则 AI 收不到信号，关键帧无法编码
+            graceful_stop = self._graceful_stop_of(api)
+            if graceful_stop is not None:
+                self.logger.info("🎬 Stopping recording gracefully...")
+                graceful_stop(5000)  # 5秒超时
+            else:
+                api.stop()
+
+            # 停止实时分析（在 graceful_stop 之后）
+            if self._analyzer_service and self._analyzer_service.is_realtime_mode():
+                self._analyzer_service.stop_realtime_analysis()
+                self.logger.info("Stopped realtime analysis")
+
+            # 更新会话
+            session.end_time = datetime.now()
+
+            # 更新统计信息
+            session.capture_stats(api.stats)
+
+            session_info = session.to_dict()
+            self.logger.info(f"Recording stopped: {session.output_path}")
 
-                # 停止实时分析（在 graceful_stop 之后）
-                if self._analyzer_service and self._analyzer_service.is_realtime_mode():
-                    self._analyzer_service.stop_realtime_analysis()
-                    self.logger.info("Stopped realtime analysis")
+        except Exception as e:
+            self.logger.error(f"Error stopping recording: {e}")
+            self._restore_session(session)
+            return False
 
-                # 更新会话
-                self._current_session.end_time = datetime.now()
+        self._release_session(session)
 
-                # 更新统计信息
-                stats = self._api.stats
-                if hasattr(stats, 'to_dict'):
-                    self._current_session.stats = stats.to_dict()
-                else:
-                    self._current_session.stats = {
-                        "frame_count": getattr(stats, 'frame_count', 0),
-                        "encoded_count": getattr(stats, 'encoded_count', 0),
-                        "dropped_count": getattr(stats, 'dropped_count', 0),
-                        "file_size": getattr(stats, 'output_file_size', 0),
-                    }
-
-                session_info = self._current_session.to_dict()
-                self.logger.info(f"Recording stopped: {self._current_session.output_path}")
-
-                # 更新录制历史到数据库
-                if self._history_service:
-                    try:
-                        self._history_service.update_recording(
-                            record_id=self._current_session.session_id,
-                            end_time=self._current_session.end_time,
-                            file_size=session_info["stats"].get("file_size", 0),
-                            duration=int(session_info["stats"].get("duration", 0)),
-                            notes=f"Recorded in {'SNAPSHOT' if self._pending_mode == RecorderMode.SNAPSHOT else 'VIDEO'} mode"
-                        )
-                        self.logger.info(f"Updated recording history: {self._current_session.session_id}")
-                    except Exception as e:
-                        self.logger.error(f"Failed to update recording history: {e}")
-
-                # 清空会话
-                self._current_session = None
+        # 更新录制历史到数据库
+        if self._history_service:
+            try:
+                self._history_service.update_recording(
+                    record_id=session.session_id,
+                    end_time=session.end_time,
+                    file_size=session_info["stats"].get("file_size", 0),
+                    duration=int(session_info["stats"].get("duration", 0)),
+                    notes=f"Recorded in {self._mode_name()} mode"
+                )
+                self.logger.info(f"Updated recording history: {session.session_id}")
+            except Exception as e:
+                self.logger.error(f"Failed to update recording history: {e}")
 
-                return True
+        return True
 
-            except Exception as e:
-                self.logger.error(f"Error stopping recording: {e}")
-                return False
+    def _mode_name(self) -> str:
+        """当前录制模式名称"""
+        return "SNAPSHOT" if self._mode_is_snapshot else "VIDEO"
 
     def set_recording_mode(self, mode) -> bool:
         """
@@ -350,7 +531,8 @@ class RecorderService:
 
         # 缓存模式，以便在API初始化后应用
         self._pending_mode = mode
-        mode_name = "SNAPSHOT" if mode == RecorderMode.SNAPSHOT else "VIDEO"
+        self._mode_is_snapshot = mode == RecorderMode.SNAPSHOT
+        mode_name = self._mode_name()
 
         if self._api is None:
             self.logger.info(f"Capture mode set to {mode_name} (pending, API not initialized)")
@@ -362,7 +544,7 @@ class RecorderService:
 
             # SNAPSHOT模式：自动启用实时分析
             if self._auto_enable_realtime and self._analyzer_service:
-                if mode == RecorderMode.SNAPSHOT:
+                if self._mode_is_snapshot:
                     self._analyzer_service.start_realtime_analysis()
                     self.logger.info("📊 SNAPSHOT模式：启用实时分析")
                 else:
@@ -421,56 +603,136 @@ class RecorderService:
         Returns:
             bool: 成功返回True
         """
-        with self._lock:
-            if self._current_session is None:
-                self.logger.warning("No active recording session")
-                return False
+        taken = self._take_active_session()
+        if taken is None:
+            return False
+        session, api = taken
 
-            if self._api is None:
-                self.logger.error("Recorder API not initialized")
-                return False
+        try:
+            self.logger.info(f"Gracefully stopping recording (timeout={timeout_ms}ms)...")
 
-            try:
-                self.logger.info(f"Gracefully stopping recording (timeout={timeout_ms}ms)...")
-                
-                # 调用优雅停止
-                self._api.graceful_stop(timeout_ms)
-
-                # 更新会话
-                self._current_session.end_time = datetime.now()
-
-                # 更新统计信息
-                stats = self._api.stats
-                if hasattr(stats, 'to_dict'):
-                    self._current_session.stats = stats.to_dict()
-                else:
-                    self._current_session.stats = {
-                        "frame_count": getattr(stats, 'frame_count', 0),
-                        "encoded_count": getattr(stats, 'encoded_count', 0),
-                        "dropped_count": getattr(stats, 'dropped_count', 0),
-                        "file_size": getattr(stats, 'output_file_size', 0),
-                    }
+            # 调用优雅停止
+            api.graceful_stop(timeout_ms)
 
-                session_info = self._current_session.to_dict()
-                self.logger.info(f"Recording gracefully stopped: {self._current_session.output_path}")
+            # 更新会话
+            session.end_time = datetime.now()
 
-                # 清空会话
-                self._current_session = None
+            # 更新统计信息
+            session.capture_stats(api.stats)
+            self.logger.info(f"Recording gracefully stopped: {session.output_path}")
 
-                return True
+        except Exception as e:
+            self.logger.error(f"Error gracefully stopping recording: {e}")
+            self._restore_session(session)
+            return False
 
+        self._release_session(session)
+        return True
+
+    def _start_io_thread(self):
+        """启动原生调用后台线程"""
+        with self._lock:
+            if self._io_thread is not None and self._io_thread.is_alive():
+                return
+            self._io_thread = threading.Thread(target=self._io_loop, name="RecorderIO", daemon=True)
+            self._io_thread.start()
+
+    def _stop_io_thread(self, timeout: float = 5.0):
+        """执行完队列中剩余的调用后停止后台线程"""
+        if self._io_thread is None:
+            return
+        self._io_queue.put(_IO_STOP)
+        self._io_thread.join(timeout=timeout)
+        self._io_thread = None
+
+    def _io_loop(self):
+        """后台调用循环：逐个执行并把结果写入对应的 Future"""
+        q = self._io_queue
+        while True:
+            item = q.get()
+            if item is _IO_STOP:
+                return
+            func, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
             except Exception as e:
-                self.logger.error(f"Error gracefully stopping recording: {e}")
-                return False
+                future.set_exception(e)
+
+    def _submit(self, func: Callable[[], Any]) -> Future:
+        """提交到后台线程执行（队列满时阻塞等待）"""
+        future = Future()
+        self._start_io_thread()
+        self._io_queue.put((func, future))
+        return future
+
+    def stop_recording_nowait(self) -> Future:
+        """
+        在后台线程停止录制，立即返回
+
+        Returns:
+            Future: 结果同 stop_recording()
+        """
+        return self._submit(self.stop_recording)
+
+    def pause_recording_nowait(self) -> Future:
+        """
+        在后台线程暂停录制，立即返回
+
+        Returns:
+            Future: 结果同 pause_recording()
+        """
+        return self._submit(self.pause_recording)
+
+    def resume_recording_nowait(self) -> Future:
+        """
+        在后台线程恢复录制，立即返回
+
+        Returns:
+            Future: 结果同 resume_recording()
+        """
+        return self._submit(self.resume_recording)
+
+    async def stop_recording_async(self) -> bool:
+        """停止录制的协程版本，在后台线程执行，不阻塞事件循环"""
+        return await asyncio.wrap_future(self.stop_recording_nowait())
+
+    async def pause_recording_async(self) -> bool:
+        """暂停录制的协程版本"""
+        return await asyncio.wrap_future(self.pause_recording_nowait())
+
+    async def resume_recording_async(self) -> bool:
+        """恢复录制的协程版本"""
+        return await asyncio.wrap_future(self.resume_recording_nowait())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待已提交的后台调用全部完成
+
+        Args:
+            timeout: 等待上限（秒），None 表示一直等待
+
+        Returns:
+            bool: 全部完成返回True，超时返回False
+        """
+        if self._io_thread is None:
+            return True
+        try:
+            self._submit(lambda: None).result(timeout)
+            return True
+        except FutureTimeoutError:
+            return False
 
     def get_recording_info(self) -> Dict[str, Any]:
         """
-        获取录制信息
+        获取录制信息（录制中时 16ms 内的重复调用复用同一份快照，每次返回其浅拷贝）
 
         Returns:
             dict: 录制信息字典
         """
-        if self._current_session is None:
+        session, active = self._state
+        if not active:
             return {
                 "is_recording": False,
                 "frame_count": 0,
@@ -481,10 +743,16 @@ class RecorderService:
                 "current_fps": 0.0
             }
 
+        now = time.monotonic_ns()
+        cached_at, cached_session, cached = self._info_cache
+        if cached_session is session and now - cached_at < _INFO_TTL_NS:
+            return cached.copy()
+
         try:
-            if self._api is None or self._current_session is None or self._current_session.start_time is None:
+            api = self._api
+            if api is None:
                 return {
-                    "is_recording": self._current_session is not None,
+                    "is_recording": True,
                     "frame_count": 0,
                     "encoded_count": 0,
                     "dropped_count": 0,
@@ -493,20 +761,21 @@ class RecorderService:
                     "current_fps": 0.0
                 }
 
-            stats = self._api.stats
-            duration = (datetime.now() - self._current_session.start_time).total_seconds()
+            frame_count, encoded_count, dropped_count, file_size, current_fps, _ = _read_stats(api.stats)
 
-            return {
+            info = {
                 "is_recording": True,
-                "session_id": self._current_session.session_id,
-                "output_path": self._current_session.output_path,
-                "frame_count": getattr(stats, 'frame_count', 0),
-                "encoded_count": getattr(stats, 'encoded_count', 0),
-                "dropped_count": getattr(stats, 'dropped_count', 0),
-                "duration": duration,
-                "file_size": getattr(stats, 'output_file_size', 0),
-                "current_fps": getattr(stats, 'current_fps', 0.0)
+                "session_id": session.session_id,
+                "output_path": session.output_path,
+                "frame_count": frame_count,
+                "encoded_count": encoded_count,
+                "dropped_count": dropped_count,
+                "duration": session.elapsed(),
+                "file_size": file_size,
+                "current_fps": current_fps
             }
+            self._info_cache = (now, session, info)
+            return info.copy()
 
         except Exception as e:
             self.logger.error(f"Error getting recording info: {e}")
@@ -531,7 +800,7 @@ class RecorderService:
         Returns:
             bool: 正在录制返回True
         """
-        return self._current_session is not None
+        return self._state[1]
 
     def get_api(self):
         """
@@ -544,23 +813,28 @@ class RecorderService:
 
     def set_status_callback(self, callback: Callable):
         """设置状态变化回调"""
-        if callback not in self._status_callbacks:
-            self._status_callbacks.append(callback)
+        with self._lock:
+            if callback not in self._status_callbacks:
+                self._status_callbacks = self._status_callbacks + (callback,)
 
     def set_progress_callback(self, callback: Callable):
         """设置进度回调"""
-        if callback not in self._progress_callbacks:
-            self._progress_callbacks.append(callback)
+        with self._lock:
+            if callback not in self._progress_callbacks:
+                self._progress_callbacks = self._progress_callbacks + (callback,)
 
     def set_error_callback(self, callback: Callable):
         """设置错误回调"""
-        if callback not in self._error_callbacks:
-            self._error_callbacks.append(callback)
+        with self._lock:
+            if callback not in self._error_callbacks:
+                self._error_callbacks = self._error_callbacks + (callback,)
 
     def shutdown(self):
         """关闭录制服务"""
+        self._stop_io_thread()
         self.stop_recording()
         self.module_manager.shutdown_recorder()
         self._api = None
-        self._current_session = None
+        with self._lock:
+            self._detach_session()
         self.logger.info("RecorderService shutdown")
@@ -0,0 +1,271 @@
+"""AnalyzerService 单元测试"""
+import sys
+import threading
+import unittest
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.process_manager import ProcessStatus
+from services.analyzer_service import AnalyzerService, AnalysisSession, KeyFrameResult, _fan_out
+
+
+class _FakeModuleManager:
+    """仅记录状态变更的模块管理器替身"""
+
+    def __init__(self):
+        self.analyzer_statuses = []
+
+    def set_analyzer_status(self, status):
+        self.analyzer_statuses.append(status)
+
+    def get_analyzer_status(self):
+        return self.analyzer_statuses[-1] if self.analyzer_statuses else ProcessStatus.STOPPED
+
+
+class _FakeHistoryService:
+    """记录写入调用的历史服务替身"""
+
+    def __init__(self):
+        self.keyframe_videos = []
+        self.batches = []
+
+    @contextmanager
+    def buffered(self):
+        self.batches.append([])
+        yield self
+
+    def add_keyframe_video(self, **kwargs):
+        self.keyframe_videos.append(kwargs)
+        self.batches[-1].append(kwargs["keyframe_count"])
+        return "kf"
+
+
+class TestAnalysisSession(unittest.TestCase):
+    """分析会话测试"""
+
+    def test_to_dict_uses_cached_iso(self):
+        start = datetime(2024, 1, 2, 3, 4, 5)
+        session = AnalysisSession(session_id="s1", start_time=start)
+        self.assertEqual(session.start_time_iso, start.isoformat())
+
+        info = session.to_dict()
+        self.assertEqual(info["start_time"], start.isoformat())
+        self.assertIsNone(info["end_time"])
+
+        end = datetime(2024, 1, 2, 3, 5, 0)
+        session.finish(end)
+        self.assertEqual(session.to_dict()["end_time"], end.isoformat())
+
+    def test_elapsed_is_monotonic(self):
+        session = AnalysisSession(session_id="s2", start_time=datetime.now())
+        first = session.elapsed()
+        self.assertGreaterEqual(first, 0.0)
+        self.assertGreaterEqual(session.elapsed(), first)
+
+
+class TestAnalyzerServiceCallbacks(unittest.TestCase):
+    """回调注册测试"""
+
+    def setUp(self):
+        self.manager = _FakeModuleManager()
+        self.service = AnalyzerService(self.manager)
+
+    def test_register_callback_once(self):
+        def callback(_):
+            pass
+
+        self.service.set_status_callback(callback)
+        self.service.set_status_callback(callback)
+        self.assertEqual(self.service._status_callbacks, (callback,))
+
+    def test_registration_does_not_mutate_snapshot(self):
+        def first(_):
+            pass
+
+        def second(_):
+            pass
+
+        self.service.set_keyframe_callback(first)
+        snapshot = self.service._keyframe_callbacks
+        self.service.set_keyframe_callback(second)
+        self.assertEqual(snapshot, (first,))
+        self.assertEqual(self.service._keyframe_callbacks, (first, second))
+
+    def test_register_rejects_invalid_callbacks(self):
+        with self.assertRaises(TypeError):
+            self.service.set_error_callback("not callable")
+        with self.assertRaises(TypeError):
+            self.service.set_error_callback(lambda a, b: None)
+        self.assertEqual(self.service._error_callbacks, ())
+
+    def test_fan_out_continues_after_failure(self):
+        calls = []
+        errors = []
+
+        def failing(arg):
+            raise RuntimeError("boom")
+
+        _fan_out((calls.append, failing, calls.append), "x", errors.append, "test")
+        self.assertEqual(calls, ["x", "x"])
+        self.assertEqual(len(errors), 1)
+
+
+class TestKeyframeSnapshot(unittest.TestCase):
+    """关键帧结果快照测试"""
+
+    def test_snapshot_reused_until_new_result(self):
+        service = AnalyzerService(_FakeModuleManager())
+        self.assertEqual(service.get_keyframe_results(), ())
+
+        session = AnalysisSession(session_id="s", start_time=datetime.now())
+        service._current_session = session
+        session.keyframe_results.append(KeyFrameResult(0, 0.0, 0.9, "scene_change"))
+        service._keyframe_version += 1
+
+        first = service.get_keyframe_results()
+        self.assertEqual(len(first), 1)
+        self.assertIs(service.get_keyframe_results(), first)
+
+        session.keyframe_results.append(KeyFrameResult(1, 1.0, 0.8, "scene_change"))
+        service._keyframe_version += 1
+        self.assertEqual(len(service.get_keyframe_results()), 2)
+
+
+class TestDetectorConfig(unittest.TestCase):
+    """检测器配置测试"""
+
+    def test_get_returns_read_only_view(self):
+        service = AnalyzerService(_FakeModuleManager())
+        config = service.get_detector_config("motion")
+        self.assertIs(service.get_detector_config("motion"), config)
+        with self.assertRaises(TypeError):
+            config["enabled"] = False
+
+    def test_set_replaces_config(self):
+        service = AnalyzerService(_FakeModuleManager())
+        before = service.get_detector_config("text")
+        service.set_detector_config("text", enabled=True, threshold=0.5)
+
+        after = service.get_detector_config("text")
+        self.assertEqual(dict(after), {"enabled": True, "threshold": 0.5})
+        self.assertEqual(dict(before), {"enabled": False, "threshold": 0.7})
+        self.assertEqual(dict(service.get_detector_config("unknown")), {})
+
+
+class TestDetectorType(unittest.TestCase):
+    """检测器类型推断测试"""
+
+    def test_detect_detector_type(self):
+        service = AnalyzerService(_FakeModuleManager())
+        self.assertEqual(service._detect_detector_type({"frame_index": 1, "score": 0.9}), "scene_change")
+
+
+class _FakeAnalyzerAPI:
+    """记录调用时锁状态的分析器API替身"""
+
+    def __init__(self, service, result=True):
+        self._service = service
+        self._result = result
+        self.lock_held = []
+        self.last_error = "failed"
+        self.stats = None
+
+    def start(self):
+        self.lock_held.append(self._service._lock.locked())
+        return self._result
+
+    def stop(self):
+        self.lock_held.append(self._service._lock.locked())
+
+
+class _BlockingStopAnalyzerAPI(_FakeAnalyzerAPI):
+    """stop 阻塞到放行为止的分析器API替身"""
+
+    def __init__(self, service):
+        super().__init__(service)
+        self.starts = 0
+        self.stopping = threading.Event()
+        self.release = threading.Event()
+
+    def start(self):
+        self.starts += 1
+        return True
+
+    def stop(self):
+        self.stopping.set()
+        self.release.wait(5)
+
+
+class TestAnalyzerServiceSession(unittest.TestCase):
+    """会话状态切换测试"""
+
+    def test_api_called_outside_lock(self):
+        service = AnalyzerService(_FakeModuleManager())
+        service._api = _FakeAnalyzerAPI(service)
+
+        self.assertTrue(service.start_analysis("rec"))
+        self.assertFalse(service.start_analysis("rec"))
+        self.assertEqual(service._current_session.recording_id, "rec")
+        self.assertTrue(service.stop_analysis())
+        self.assertIsNone(service._current_session)
+        self.assertEqual(service._api.lock_held, [False, False])
+
+    def test_start_rejected_while_stop_in_flight(self):
+        service = AnalyzerService(_FakeModuleManager())
+        api = service._api = _BlockingStopAnalyzerAPI(service)
+
+        self.assertTrue(service.start_analysis("rec"))
+        stopper = threading.Thread(target=service.stop_analysis)
+        stopper.start()
+        self.assertTrue(api.stopping.wait(5))
+
+        self.assertFalse(service.start_analysis("next"))
+        self.assertFalse(service.stop_analysis())
+        self.assertEqual(api.starts, 1)
+
+        api.release.set()
+        stopper.join(5)
+        self.assertIsNone(service._current_session)
+        self.assertTrue(service.start_analysis("next"))
+        self.assertEqual(api.starts, 2)
+
+    def test_failed_start_releases_session(self):
+        service = AnalyzerService(_FakeModuleManager())
+        service._api = _FakeAnalyzerAPI(service, result=False)
+
+        self.assertFalse(service.start_analysis())
+        self.assertIsNone(service._current_session)
+
+
+class TestAnalyzerServiceWriter(unittest.TestCase):
+    """后台写入线程测试"""
+
+    def test_writer_flushes_pending_items_on_stop(self):
+        service = AnalyzerService(_FakeModuleManager())
+        history = _FakeHistoryService()
+        service._history_service = history
+
+        for i in range(5):
+            service._write_queue.put({
+                "recording_id": "rec",
+                "video_path": f"/tmp/kf_{i}.mp4",
+                "keyframe_count": i,
+                "duration": 0.0,
+                "file_size": 0,
+                "extraction_config": service._detector_config
+            })
+        service._start_writer()
+        service._stop_writer()
+
+        self.assertIsNone(service._writer_thread)
+        self.assertEqual([item["keyframe_count"] for item in history.keyframe_videos], [0, 1, 2, 3, 4])
+        self.assertIsInstance(history.keyframe_videos[0]["extraction_config"]["motion"], dict)
+        # 队列中已有的记录在同一事务中写入
+        self.assertEqual(history.batches, [[0, 1, 2, 3, 4]])
+
+
+if __name__ == '__main__':
+    unittest.main()
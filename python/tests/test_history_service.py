@@ -0,0 +1,213 @@
+"""HistoryService 单元测试"""
+import json
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database.database_manager import DatabaseManager
+from services.history_service import HistoryService
+
+
+class TestHistoryService(unittest.TestCase):
+    """历史记录服务测试"""
+
+    def setUp(self):
+        """每个测试前重置单例并使用临时目录"""
+        DatabaseManager._instance = None
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name) / "history"
+        self.db_path = str(Path(self.temp_dir.name) / "history.db")
+        self.service = HistoryService(str(self.data_dir), self.db_path)
+
+    def tearDown(self):
+        """清理"""
+        self.service.db_manager.close()
+        DatabaseManager._instance = None
+        self.temp_dir.cleanup()
+
+    def _reload(self) -> HistoryService:
+        """模拟重启后重新加载"""
+        self.service.db_manager.close()
+        DatabaseManager._instance = None
+        self.service = HistoryService(str(self.data_dir), self.db_path)
+        return self.service
+
+    def test_recordings_round_trip(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording(
+            "/videos/测试.mp4", start, start + timedelta(seconds=90), 2048, notes="备注"
+        )
+        analysis_id = self.service.add_analysis(record_id, start, start, 3, 10, [{"score": 0.9}])
+
+        service = self._reload()
+        record = service.get_recording(record_id)
+        self.assertEqual(record.file_path, "/videos/测试.mp4")
+        self.assertEqual(record.duration, 90)
+        self.assertEqual(record.notes, "备注")
+        self.assertEqual(service.get_analysis(analysis_id).results, [{"score": 0.9}])
+
+    def test_cached_records_not_shared(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording("/videos/a.mp4", start, start, 10)
+        analysis_id = self.service.add_analysis(record_id, start, start, 1, 1)
+
+        self.service.get_recording(record_id).notes = "changed"
+        self.service.get_analysis(analysis_id).results.append({"x": 1})
+        self.assertEqual(self.service.get_recording(record_id).notes, "")
+        self.assertEqual(self.service.get_analysis(analysis_id).results, [])
+
+    def test_analyses_stored_in_database(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording("/videos/a.mp4", start, start, 1)
+        analysis_ids = [self.service.add_analysis(record_id, start, start, i, 0) for i in range(5)]
+        self.assertEqual(self.service.get_analysis(analysis_ids[0]).keyframe_count, 0)
+        for analysis_id in analysis_ids[:-1]:
+            self.assertTrue(self.service.delete_analysis(analysis_id))
+        self.assertIsNone(self.service.get_analysis(analysis_ids[0]))
+        self.assertFalse(self.service.delete_analysis(analysis_ids[0]))
+
+        service = self._reload()
+        self.assertEqual(service.analysis_run_dao.count(), 1)
+        self.assertEqual(service.get_analysis(analysis_ids[-1]).keyframe_count, 4)
+        self.assertEqual(list(self.data_dir.iterdir()), [])
+
+    def test_buffered_is_one_transaction(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        connection = self.service.db_manager._get_connection()
+        with self.service.buffered():
+            record_id = self.service.add_recording("/videos/bulk.mp4", start, start, 1)
+            with self.service.buffered():
+                self.service.add_analysis(record_id, start, start, 1, 0)
+            self.assertTrue(connection.in_transaction)
+        self.assertFalse(connection.in_transaction)
+        self.assertEqual(len(self._reload().get_analyses_for_recording(record_id)), 1)
+
+    def test_delete_persists(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        kept = self.service.add_recording("/videos/keep.mp4", start, start, 1)
+        dropped = self.service.add_recording("/videos/drop.mp4", start, start, 1)
+        self.service.add_analysis(dropped, start, start, 0, 0)
+        self.service.delete_recording(dropped)
+
+        service = self._reload()
+        self.assertIsNotNone(service.get_recording(kept))
+        self.assertIsNone(service.get_recording(dropped))
+        self.assertEqual(service.get_all_analyses(), [])
+
+    def test_migrates_legacy_json(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording("/videos/old.mp4", start, start, 10)
+
+        # 旧版文件中的备注与关键帧数合并进数据库，分析记录导入数据库
+        recordings = [dict(self.service.get_recording(record_id).to_dict(), notes="旧备注", keyframe_count=7)]
+        analyses = [{
+            "record_id": "legacy", "recording_id": record_id,
+            "start_time": "2024-01-01T00:00:00", "end_time": "2024-01-01T00:01:00",
+            "keyframe_count": 3, "analyzed_frames": 60
+        }]
+        (self.data_dir / "recordings.json").write_text(json.dumps(recordings), encoding='utf-8')
+        (self.data_dir / "analyses.json").write_text(json.dumps(analyses), encoding='utf-8')
+
+        service = self._reload()
+        record = service.get_recording(record_id)
+        self.assertEqual((record.notes, record.keyframe_count), ("旧备注", 7))
+        self.assertEqual(service.get_analysis("legacy").analyzed_frames, 60)
+        self.assertFalse((self.data_dir / "analyses.json").exists())
+        self.assertFalse((self.data_dir / "recordings.json").exists())
+        self.assertTrue((self.data_dir / "analyses.json.migrated").exists())
+
+    def test_save_ai_analysis_result_is_atomic(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording("/videos/ai.mp4", start, start, 1)
+        result = {
+            "summary_md": "summary",
+            "timestamp_events": [{"timestamp_seconds": 5, "title": "a"}, {"timestamp_seconds": 65, "title": "b"}],
+            "key_findings": [{"title": "f", "content": "c"}],
+            "analysis_metadata": [{"key": "k", "value": 1}]
+        }
+        self.assertTrue(self.service.save_ai_analysis_result(record_id, result))
+
+        analysis = self.service.ai_analysis_dao.get_by_recording_id(record_id)[0]
+        events = self.service.timestamp_event_dao.get_by_analysis_id(analysis.analysis_id)
+        self.assertEqual([e.title for e in events], ["a", "b"])
+        self.assertEqual(len(self.service.key_finding_dao.get_by_analysis_id(analysis.analysis_id)), 1)
+
+        details = self.service.get_analysis_details(record_id)
+        self.assertEqual([t["time"] for t in details["timestamps"]], ["00:05", "01:05"])
+        self.assertEqual(details["keyFindings"], ["c"])
+
+        # 子表写入失败时主记录一并回滚
+        bad = dict(result, timestamp_events=[{"timestamp_seconds": 1, "importance_score": 99}])
+        self.assertFalse(self.service.save_ai_analysis_result(record_id, bad))
+        self.assertEqual(len(self.service.ai_analysis_dao.get_by_recording_id(record_id)), 1)
+
+    def test_search_and_cascade(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        first = self.service.add_recording("/videos/Meeting.mp4", start, start, 1)
+        second = self.service.add_recording("/videos/demo.mp4", start, start, 1, notes="Weekly meeting")
+        a1 = self.service.add_analysis(first, start, start, 0, 0)
+        a2 = self.service.add_analysis(first, start, start, 0, 0)
+
+        self.assertEqual({r.record_id for r in self.service.search_recordings("MEETING")}, {first, second})
+        self.service.update_recording_notes(second, "")
+        self.assertEqual([r.record_id for r in self.service.search_recordings("meeting")], [first])
+
+        self.assertEqual([a.record_id for a in self.service.get_analyses_for_recording(first)], [a1, a2])
+        self.service.delete_analysis(a1)
+        self.assertEqual([a.record_id for a in self.service.get_analyses_for_recording(first)], [a2])
+        self.service.delete_recording(first)
+        self.assertEqual(self.service.get_analyses_for_recording(first), [])
+        self.assertIsNone(self.service.get_analysis(a2))
+
+    def test_toggle_favorite(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording("/videos/fav.mp4", start, start, 1)
+
+        self.assertTrue(self.service.toggle_favorite(record_id))
+        self.assertIs(self.service.recording_dao.get_by_id(record_id).metadata["is_favorite"], True)
+        self.assertTrue(self.service.toggle_favorite(record_id))
+        self.assertIs(self.service.recording_dao.get_by_id(record_id).metadata["is_favorite"], False)
+        self.assertFalse(self.service.toggle_favorite("missing"))
+
+    def test_clear_all(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        record_id = self.service.add_recording("/videos/clear.mp4", start, start, 1)
+        self.service.add_analysis(record_id, start, start, 0, 0)
+        self.service.save_ai_analysis_result(record_id, {"summary_md": "s"})
+
+        self.assertTrue(self.service.clear_all())
+        self.assertEqual(self.service.ai_analysis_dao.get_by_recording_id(record_id), [])
+
+        service = self._reload()
+        self.assertEqual(service.get_all_recordings(), [])
+        self.assertEqual(service.get_all_analyses(), [])
+
+    def test_statistics_aggregate(self):
+        self.assertEqual(self.service.get_statistics()["total_recordings"], 0)
+
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        first = self.service.add_recording("/videos/a.mp4", start, start + timedelta(seconds=30), 100, keyframe_count=2)
+        self.service.add_recording("/videos/b.mp4", start, start + timedelta(seconds=90), 300, keyframe_count=4)
+        self.service.start_recording("/videos/in_progress.mp4", start)
+
+        stats = self.service.get_statistics()
+        self.assertEqual(stats["total_recordings"], 2)
+        self.assertEqual(stats["total_duration"], 120)
+        self.assertEqual(stats["total_size"], 400)
+        self.assertEqual(stats["total_keyframes"], 6)
+        self.assertEqual(stats["average_size"], 200)
+
+        # 统计结果缓存至下一次修改
+        self.service.add_analysis(first, start, start, 0, 0)
+        self.assertEqual(self.service.get_statistics()["total_analyses"], 1)
+        self.service.delete_recording(first)
+        stats = self.service.get_statistics()
+        self.assertEqual((stats["total_recordings"], stats["total_analyses"]), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
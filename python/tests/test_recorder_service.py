@@ -0,0 +1,402 @@
+"""RecorderService 单元测试"""
+import asyncio
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.process_manager import ProcessStatus
+from services.recorder_service import RecorderService, RecordingSession, _file_timestamp, _read_stats
+
+
+class _FakeModuleManager:
+    """仅记录状态变更的模块管理器替身"""
+
+    def __init__(self):
+        self.recorder_statuses = []
+
+    def set_recorder_status(self, status):
+        self.recorder_statuses.append(status)
+
+    def get_recorder_status(self):
+        return self.recorder_statuses[-1] if self.recorder_statuses else ProcessStatus.STOPPED
+
+
+class _FakeRecorderAPI:
+    """保存内部回调的录制器 API 替身"""
+
+    def set_status_callback(self, callback):
+        self.status_callback = callback
+
+    def set_error_callback(self, callback):
+        self.error_callback = callback
+
+
+class _Status:
+    def __init__(self, name):
+        self.name = name
+
+
+class TestRecorderServiceCallbacks(unittest.TestCase):
+    """回调注册测试"""
+
+    def setUp(self):
+        self.manager = _FakeModuleManager()
+        self.service = RecorderService(self.manager)
+
+    def test_register_callback_once(self):
+        def callback(_):
+            pass
+
+        self.service.set_status_callback(callback)
+        self.service.set_status_callback(callback)
+        self.assertEqual(self.service._status_callbacks, (callback,))
+
+    def test_registration_does_not_mutate_snapshot(self):
+        def first(_):
+            pass
+
+        def second(_):
+            pass
+
+        self.service.set_error_callback(first)
+        snapshot = self.service._error_callbacks
+        self.service.set_error_callback(second)
+        self.assertEqual(snapshot, (first,))
+        self.assertEqual(self.service._error_callbacks, (first, second))
+
+    def test_status_maps_exact_names(self):
+        api = _FakeRecorderAPI()
+        self.service._api = api
+        self.service._setup_internal_callbacks()
+
+        received = []
+        self.service.set_status_callback(received.append)
+        for name in ("RECORDING", "PAUSED", "STOPPING", "IDLE"):
+            api.status_callback(_Status(name))
+
+        self.assertEqual(
+            self.manager.recorder_statuses,
+            [ProcessStatus.RUNNING, ProcessStatus.PAUSED, ProcessStatus.STOPPED]
+        )
+        self.assertEqual([s.name for s in received], ["RECORDING", "PAUSED", "STOPPING", "IDLE"])
+
+
+class TestRecordingSession(unittest.TestCase):
+    """录制会话测试"""
+
+    def test_elapsed_is_monotonic(self):
+        session = RecordingSession("a.mp4")
+        session.begin()
+        self.assertIsNotNone(session.start_time)
+        first = session.elapsed()
+        self.assertGreaterEqual(first, 0.0)
+        self.assertGreaterEqual(session.elapsed(), first)
+
+    def test_session_has_no_instance_dict(self):
+        session = RecordingSession("a.mp4")
+        self.assertFalse(hasattr(session, "__dict__"))
+        self.assertEqual(session.to_dict()["output_path"], "a.mp4")
+
+
+class _NativeStats:
+    """与 RecordingStats 绑定字段一致的统计对象替身"""
+    frame_count, encoded_count, dropped_count = 10, 9, 1
+    file_size_bytes, current_fps, duration_seconds = 2048, 30.0, 2.5
+
+
+class TestReadStats(unittest.TestCase):
+    """原生统计字段读取测试"""
+
+    def test_reads_all_fields(self):
+        self.assertEqual(_read_stats(_NativeStats()), (10, 9, 1, 2048, 30.0, 2.5))
+
+    def test_missing_fields_fall_back_individually(self):
+        class Stats:
+            frame_count = 5
+
+        self.assertEqual(_read_stats(Stats()), (5, 0, 0, 0, 0.0, 0.0))
+
+    def test_capture_stats_uses_session_keys(self):
+        session = RecordingSession("a.mp4")
+        session.begin()
+        session.capture_stats(_NativeStats())
+        stats = session.to_dict()["stats"]
+        self.assertEqual((stats["file_size"], stats["duration"]), (2048, 2.5))
+
+        session.capture_stats(object())
+        self.assertEqual(stats.keys(), session.stats.keys())
+        self.assertGreaterEqual(session.stats["duration"], 0.0)
+
+
+class _FakeStats:
+    frame_count, encoded_count, dropped_count = 3, 3, 0
+    file_size_bytes, current_fps = 100, 30.0
+
+
+class _FakeStartableAPI(_FakeRecorderAPI):
+    """可启动/停止的录制器 API 替身"""
+
+    stats = _FakeStats()
+    last_error = ""
+
+    def initialize(self, config):
+        self.config = config
+
+    def start(self):
+        return True
+
+    def stop(self):
+        pass
+
+
+def _lock_free_elsewhere(lock) -> bool:
+    """从另一线程尝试获取锁，判断当前线程是否持有（可重入锁没有 locked()）"""
+    result = []
+
+    def probe():
+        acquired = lock.acquire(False)
+        if acquired:
+            lock.release()
+        result.append(acquired)
+
+    thread = threading.Thread(target=probe)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class _LockProbingAPI(_FakeStartableAPI):
+    """记录原生调用时服务锁是否空闲的 API 替身"""
+
+    def __init__(self, service):
+        self._service = service
+        self.lock_free = []
+
+    def start(self):
+        self.lock_free.append(_lock_free_elsewhere(self._service._lock))
+        return True
+
+    def graceful_stop(self, timeout_ms):
+        self.lock_free.append(_lock_free_elsewhere(self._service._lock))
+
+
+class _BlockingStopAPI(_FakeStartableAPI):
+    """graceful_stop 阻塞到放行为止的 API 替身"""
+
+    def __init__(self):
+        self.stopping = threading.Event()
+        self.release = threading.Event()
+        self.starts = 0
+
+    def start(self):
+        self.starts += 1
+        return True
+
+    def graceful_stop(self, timeout_ms):
+        self.stopping.set()
+        self.release.wait(5)
+
+
+class _FakeRecorderModule:
+    class _Config:
+        """按值复制的配置替身（对应原生拷贝构造）"""
+
+        def __init__(self, output_file_path=""):
+            self.video = SimpleNamespace(output_file_path=output_file_path)
+
+        def __copy__(self):
+            return type(self)(self.video.output_file_path)
+
+    def default_recorder_config(self):
+        return self._Config()
+
+
+class _FakeRecorderMode:
+    VIDEO, SNAPSHOT = "VIDEO", "SNAPSHOT"
+
+
+@mock.patch("services.recorder_service.RecorderMode", _FakeRecorderMode)
+class TestRecordingState(unittest.TestCase):
+    """录制状态快照测试"""
+
+    def test_state_published_on_start_and_cleared_on_stop(self):
+        service = RecorderService(_FakeModuleManager())
+        service._api = _FakeStartableAPI()
+        service._recorder_module = _FakeRecorderModule()
+        service._config_template = service._recorder_module.default_recorder_config()
+        self.assertFalse(service.is_recording())
+        self.assertFalse(service.get_recording_info()["is_recording"])
+
+        self.assertTrue(service.start_recording("out.mp4"))
+        self.assertTrue(service.is_recording())
+        info = service.get_recording_info()
+        self.assertEqual((info["output_path"], info["frame_count"], info["file_size"]), ("out.mp4", 3, 100))
+        self.assertEqual(service._api.config.video.output_file_path, "out.mp4")
+        self.assertEqual(service._config_template.video.output_file_path, "")
+        # 缓存期内返回相同内容的独立副本，调用方修改互不影响
+        info["frame_count"] = -1
+        again = service.get_recording_info()
+        self.assertIsNot(again, info)
+        self.assertEqual(again["frame_count"], 3)
+
+        self.assertTrue(service.stop_recording())
+        self.assertFalse(service.is_recording())
+        self.assertEqual(service._state, (None, False))
+        self.assertFalse(service.get_recording_info()["is_recording"])
+
+    def test_new_start_does_not_touch_previous_session(self):
+        service = RecorderService(_FakeModuleManager())
+        service._api = _FakeStartableAPI()
+        service._recorder_module = _FakeRecorderModule()
+        service._config_template = service._recorder_module.default_recorder_config()
+
+        self.assertTrue(service.start_recording("a.mp4"))
+        old, _ = service._state
+        old_id = old.session_id
+        self.assertTrue(service.stop_recording())
+        self.assertTrue(service.start_recording("b.mp4"))
+
+        self.assertIsNot(service._state[0], old)
+        self.assertEqual((old.session_id, old.output_path), (old_id, "a.mp4"))
+
+    def test_start_rejected_while_stop_in_flight(self):
+        service = RecorderService(_FakeModuleManager())
+        api = service._api = _BlockingStopAPI()
+        service._recorder_module = _FakeRecorderModule()
+        service._config_template = service._recorder_module.default_recorder_config()
+
+        self.assertTrue(service.start_recording("a.mp4"))
+        stopper = threading.Thread(target=service.stop_recording)
+        stopper.start()
+        self.assertTrue(api.stopping.wait(5))
+
+        self.assertFalse(service.is_recording())
+        self.assertFalse(service.start_recording("b.mp4"))
+        self.assertFalse(service.stop_recording())
+        self.assertEqual(api.starts, 1)
+
+        api.release.set()
+        stopper.join(5)
+        self.assertTrue(service.start_recording("b.mp4"))
+        self.assertEqual(api.starts, 2)
+
+    def test_api_called_outside_lock(self):
+        service = RecorderService(_FakeModuleManager())
+        service._api = _LockProbingAPI(service)
+        service._recorder_module = _FakeRecorderModule()
+        service._config_template = service._recorder_module.default_recorder_config()
+
+        self.assertTrue(service.start_recording("out.mp4"))
+        self.assertFalse(service.start_recording("other.mp4"))
+        self.assertTrue(service.graceful_stop_recording())
+        self.assertFalse(service.graceful_stop_recording())
+        self.assertIsNone(service._current_session)
+        self.assertEqual(service._api.lock_free, [True, True])
+
+    def test_graceful_stop_probed_once_per_api(self):
+        service = RecorderService(_FakeModuleManager())
+        api = _LockProbingAPI(service)
+        first = service._graceful_stop_of(api)
+        self.assertIs(service._graceful_stop_of(api), first)
+        self.assertIsNotNone(first)
+        self.assertIsNone(service._graceful_stop_of(_FakeStartableAPI()))
+
+    def test_mode_flag_follows_set_recording_mode(self):
+        service = RecorderService(_FakeModuleManager())
+        self.assertEqual(service._mode_name(), "VIDEO")
+        self.assertTrue(service.set_recording_mode(_FakeRecorderMode.SNAPSHOT))
+        self.assertTrue(service._mode_is_snapshot)
+        self.assertTrue(service.set_recording_mode(_FakeRecorderMode.VIDEO))
+        self.assertEqual(service._mode_name(), "VIDEO")
+
+
+class TestOutputDir(unittest.TestCase):
+    """输出目录测试"""
+
+    def test_mkdir_only_when_directory_changes(self):
+        service = RecorderService(_FakeModuleManager())
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Path(tmp) / "a"
+            with mock.patch.object(Path, "mkdir") as mkdir:
+                service._ensure_output_dir(first)
+                service._ensure_output_dir(first)
+                service._ensure_output_dir(Path(tmp) / "b")
+            self.assertEqual(mkdir.call_count, 2)
+
+    def test_settings_dir_path_reused_until_changed(self):
+        service = RecorderService(_FakeModuleManager())
+        service._settings_viewmodel = mock.Mock(outputDir="/tmp/a")
+        first = service._output_dir()
+        self.assertIs(service._output_dir(), first)
+        service._settings_viewmodel.outputDir = "/tmp/b"
+        self.assertEqual(service._output_dir(), Path("/tmp/b"))
+
+    def test_file_timestamp_matches_strftime(self):
+        now = datetime(2024, 3, 5, 7, 8, 9)
+        self.assertEqual(_file_timestamp(now), now.strftime("%Y%m%d_%H%M%S"))
+
+    def test_file_stamp_suffixed_within_same_second(self):
+        service = RecorderService(_FakeModuleManager())
+        now = datetime(2024, 3, 5, 7, 8, 9)
+        with mock.patch("services.recorder_service.datetime") as fake_datetime:
+            fake_datetime.now.return_value = now
+            stamps = [service._next_file_stamp() for _ in range(3)]
+        self.assertEqual(stamps, ["20240305_070809", "20240305_070809_1", "20240305_070809_2"])
+
+
+class TestBackgroundCalls(unittest.TestCase):
+    """后台原生调用测试"""
+
+    def setUp(self):
+        self.service = RecorderService(_FakeModuleManager())
+
+    def tearDown(self):
+        self.service._stop_io_thread()
+
+    def test_nowait_calls_run_in_order(self):
+        calls = []
+        self.service.pause_recording = lambda: calls.append("pause") or True
+        self.service.resume_recording = lambda: calls.append("resume") or True
+
+        first = self.service.pause_recording_nowait()
+        second = self.service.resume_recording_nowait()
+        self.assertTrue(self.service.flush(timeout=5))
+        self.assertTrue(first.result(0) and second.result(0))
+        self.assertEqual(calls, ["pause", "resume"])
+
+    def test_stop_without_session_reports_failure(self):
+        self.assertFalse(self.service.stop_recording_nowait().result(timeout=5))
+
+    def test_exception_delivered_through_future(self):
+        def failing():
+            raise RuntimeError("boom")
+
+        self.service.pause_recording = failing
+        with self.assertRaises(RuntimeError):
+            self.service.pause_recording_nowait().result(timeout=5)
+
+    def test_async_wrappers_await_background_result(self):
+        calls = []
+        self.service.pause_recording = lambda: calls.append("pause") or True
+        self.service.resume_recording = lambda: calls.append("resume") or True
+
+        async def run():
+            return (
+                await self.service.pause_recording_async(),
+                await self.service.resume_recording_async(),
+                await self.service.stop_recording_async(),
+            )
+
+        self.assertEqual(asyncio.run(run()), (True, True, False))
+        self.assertEqual(calls, ["pause", "resume"])
+
+
+if __name__ == "__main__":
+    unittest.main()
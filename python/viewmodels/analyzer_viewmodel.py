@@ -232,8 +232,8 @@ class AnalyzerViewModel(QObject):
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # 先完整编码再一次写入，避免 json.dump 逐片段写文件
+            output_file.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
 
             self._status = f"Exported {self._keyframe_count} keyframes to {output_file.name}"
             self.statusChanged.emit(self._status)
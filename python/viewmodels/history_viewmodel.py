@@ -113,6 +113,9 @@ class HistoryViewModel(QObject):
         # 统计信息缓存
         self._statistics: Dict[str, Any] = {}
 
+        # 已格式化的记录字典缓存（record_id -> QML 字典），记录变化时失效
+        self._formatted_cache: Dict[str, Dict[str, Any]] = {}
+
         # 缓存已渲染的 HTML
         self._html_cache: Dict[str, str] = {}
         # 正在处理的记录
@@ -142,6 +145,7 @@ class HistoryViewModel(QObject):
             records.sort(key=lambda r: r.start_time, reverse=True)
             self._history_list = records.copy()
             self._filtered_list = records.copy()
+            self._formatted_cache.clear()
             self._total_count = len(records)
 
             # 更新统计信息
@@ -174,6 +178,7 @@ class HistoryViewModel(QObject):
             if self._service.delete_recording(record_id):
                 # 从列表中移除
                 self._history_list = [r for r in self._history_list if r.record_id != record_id]
+                self._formatted_cache.pop(record_id, None)
                 self._apply_filter()
 
                 self._total_count = len(self._history_list)
@@ -262,7 +267,14 @@ class HistoryViewModel(QObject):
         Returns:
             List[Dict]: 历史记录字典列表
         """
-        return [self._format_record(r) for r in self._filtered_list]
+        cache = self._formatted_cache
+        result = []
+        for record in self._filtered_list:
+            formatted = cache.get(record.record_id)
+            if formatted is None:
+                formatted = cache[record.record_id] = self._format_record(record)
+            result.append(formatted)
+        return result
 
     @Slot(result=dict)
     def getStatistics(self) -> Dict[str, Any]:
@@ -288,6 +300,7 @@ class HistoryViewModel(QObject):
                     if record.record_id == record_id:
                         record.notes = notes
                         break
+                self._formatted_cache.pop(record_id, None)
 
                 self.historyListChanged.emit()
                 return True
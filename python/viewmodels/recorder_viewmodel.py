@@ -42,6 +42,9 @@ class RecorderViewModel(QObject):
     # 模式信号
     captureModeChanged = Signal()
 
+    # 后台停止完成（内部使用，跨线程排队到主线程）
+    _stopFinished = Signal(bool, str)
+
     def __init__(
         self,
         recorder_service: RecorderService,
@@ -72,6 +75,7 @@ class RecorderViewModel(QObject):
         self._status = "Ready"
         self._is_recording = False
         self._is_paused = False
+        self._is_stopping = False
 
         # 统计属性
         self._progress = 0.0  # 录制时长（秒）
@@ -91,6 +95,7 @@ class RecorderViewModel(QObject):
 
         # 设置服务回调
         self._setup_service_callbacks()
+        self._stopFinished.connect(self._on_stop_finished)
 
         self.logger.info("RecorderViewModel initialized")
 
@@ -175,67 +180,96 @@ class RecorderViewModel(QObject):
 
     @Slot()
     def stopRecording(self):
-        """停止录制(优雅停止,等待AI分析完成)"""
-        if not self._is_recording:
+        """停止录制(优雅停止,等待AI分析完成)；停止在后台线程进行，完成后经 _stopFinished 回到主线程"""
+        if not self._is_recording or self._is_stopping:
             return
 
         try:
             # 1. 首先停止录制，确保 MP4 文件写入完成
             # 获取当前录制路径（要在停止前获取，因为停止后 service 会清空 session）
             info = self._service.get_recording_info()
-            output_path = info.get("output_path")
+            output_path = info.get("output_path") or ""
 
-            if self._service.stop_recording():
-                self._is_recording = False
-                self._is_paused = False
-                self.isRecordingChanged.emit(False)
-                self.isPausedChanged.emit(False)
+            self._is_stopping = True
+            self._status = "Stopping..."
+            self.statusChanged.emit(self._status)
 
-                # 停止统计更新定时器
-                self._update_timer.stop()
+            future = self._service.stop_recording_nowait()
+            future.add_done_callback(lambda f: self._emit_stop_finished(f, output_path))
+        except Exception as e:
+            self._is_stopping = False
+            self.errorOccurred.emit(f"Stop recording error: {e}")
+            self.logger.error(f"Stop recording error: {e}")
 
-                self._status = "Recording Stopped"
-                self.statusChanged.emit(self._status)
-                self.logger.info(f"Recording stopped, file saved to: {output_path}")
+    def _emit_stop_finished(self, future, output_path: str):
+        """后台停止完成（在录制服务的后台线程中调用）"""
+        try:
+            success = bool(future.result())
+        except Exception as e:
+            self.logger.error(f"Stop recording error: {e}")
+            success = False
+        self._stopFinished.emit(success, output_path)
+
+    @Slot(bool, str)
+    def _on_stop_finished(self, success: bool, output_path: str):
+        """停止完成后的收尾（主线程）"""
+        self._is_stopping = False
+        if not success:
+            # 停止失败时录制仍在进行，恢复状态显示
+            self._status = "Paused" if self._is_paused else "Recording..."
+            self.statusChanged.emit(self._status)
+            self.errorOccurred.emit("Failed to stop recording")
+            return
+
+        try:
+            self._is_recording = False
+            self._is_paused = False
+            self.isRecordingChanged.emit(False)
+            self.isPausedChanged.emit(False)
 
-                # 2. 启动 AI 分析流程
-                self.logger.info(f"AI analysis check: history_viewmodel={self._history_viewmodel is not None}, output_path={output_path}")
-                if self._history_viewmodel and output_path:
-                    # 先刷新历史列表，确保能获取到刚录制的记录
-                    self._history_viewmodel.loadHistory()
+            # 停止统计更新定时器
+            self._update_timer.stop()
+
+            self._status = "Recording Stopped"
+            self.statusChanged.emit(self._status)
+            self.logger.info(f"Recording stopped, file saved to: {output_path}")
+
+            # 2. 启动 AI 分析流程
+            self.logger.info(f"AI analysis check: history_viewmodel={self._history_viewmodel is not None}, output_path={output_path}")
+            if self._history_viewmodel and output_path:
+                # 先刷新历史列表，确保能获取到刚录制的记录
+                self._history_viewmodel.loadHistory()
+                
+                # 获取最新录制记录的 ID
+                history_list = self._history_viewmodel.getHistoryList()
+                self.logger.info(f"AI analysis: history_list count={len(history_list)}")
+                if history_list:
+                    record_id = history_list[0].get("recordId", "")
+                    
+                    # 使用 PromptBuilder 构建完整提示词
+                    prompt_builder = PromptBuilder()
                     
-                    # 获取最新录制记录的 ID
-                    history_list = self._history_viewmodel.getHistoryList()
-                    self.logger.info(f"AI analysis: history_list count={len(history_list)}")
-                    if history_list:
-                        record_id = history_list[0].get("recordId", "")
-                        
-                        # 使用 PromptBuilder 构建完整提示词
-                        prompt_builder = PromptBuilder()
-                        
-                        # 获取用户自定义提示词（如果有）
-                        user_prompt = None
-                        if self._prompt_viewmodel:
-                            user_prompt = self._prompt_viewmodel.currentTemplateContent
-                        
-                        # 构建完整提示词
-                        if user_prompt:
-                            # 如果用户提供了自定义提示词，将其作为任务描述添加到系统提示词中
-                            prompt = f"{prompt_builder.SYSTEM_PROMPT}\n\n**用户任务：**\n{user_prompt}\n\n{prompt_builder.OUTPUT_FORMAT_PROMPT}"
-                        else:
-                            # 使用默认的完整提示词
-                            prompt = prompt_builder.build_prompt(scenario_category="general")
-
-                        self.logger.info(f"Starting AI analysis for record: {record_id}")
-                        self.logger.info(f"Prompt length: {len(prompt)} chars")
-                        self._history_viewmodel.startAIAnalysis(record_id, output_path, prompt)
-                        self._status = "AI Analyzing..."
-                        self.statusChanged.emit(self._status)
-                        self.logger.info(f"Started AI analysis for {record_id}")
+                    # 获取用户自定义提示词（如果有）
+                    user_prompt = None
+                    if self._prompt_viewmodel:
+                        user_prompt = self._prompt_viewmodel.currentTemplateContent
+                    
+                    # 构建完整提示词
+                    if user_prompt:
+                        # 如果用户提供了自定义提示词，将其作为任务描述添加到系统提示词中
+                        prompt = f"{prompt_builder.SYSTEM_PROMPT}\n\n**用户任务：**\n{user_prompt}\n\n{prompt_builder.OUTPUT_FORMAT_PROMPT}"
                     else:
-                        self.logger.warning("AI analysis skipped: history_list is empty")
-            else:
-                self.errorOccurred.emit("Failed to stop recording")
+                        # 使用默认的完整提示词
+                        prompt = prompt_builder.build_prompt(scenario_category="general")
+
+                    self.logger.info(f"Starting AI analysis for record: {record_id}")
+                    self.logger.info(f"Prompt length: {len(prompt)} chars")
+                    self._history_viewmodel.startAIAnalysis(record_id, output_path, prompt)
+                    self._status = "AI Analyzing..."
+                    self.statusChanged.emit(self._status)
+                    self.logger.info(f"Started AI analysis for {record_id}")
+                else:
+                    self.logger.warning("AI analysis skipped: history_list is empty")
         except Exception as e:
             self.errorOccurred.emit(f"Stop recording error: {e}")
             self.logger.error(f"Stop recording error: {e}")
@@ -243,7 +277,7 @@ class RecorderViewModel(QObject):
     @Slot()
     def pauseRecording(self):
         """暂停录制"""
-        if not self._is_recording or self._is_paused:
+        if not self._is_recording or self._is_paused or self._is_stopping:
             return
 
         try:
@@ -262,7 +296,7 @@ class RecorderViewModel(QObject):
     @Slot()
     def resumeRecording(self):
         """恢复录制"""
-        if not self._is_recording or not self._is_paused:
+        if not self._is_recording or not self._is_paused or self._is_stopping:
             return
 
         try:
@@ -564,8 +564,8 @@ class SettingsViewModel(QObject):
                 'gemini_model': self._gemini_model,
             }
 
-            with open(self._config_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # 先完整编码再一次写入，避免 json.dump 逐片段写文件
+            self._config_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
 
             self.settingsChanged.emit()
         except Exception as e: